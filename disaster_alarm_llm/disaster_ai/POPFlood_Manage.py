@@ -1,184 +1,16 @@
 #!/usr/bin/env python3
 
 
-import json
 import os
-import sys
-import graphviz
-import networkx as nx
-import matplotlib.pyplot as plt
-
-
-P_flood=0.55
-P_infra=0.8
-
-init_state = {
-    "action": ("start"),
-    "effects": {
-        ("forecast_heavy_rain", lambda P_flood: P_flood >= 0.5),
-        ("flood_not_occurred", lambda P_flood: P_flood < 0.5),
-        ("flood_risk_high", lambda P_flood: P_flood >= 0.5),
-        ("roads_open", lambda P_flood: P_flood >= 0.5),
-        ("bridges_weak", lambda P_infra: P_infra >= 0.5),
-        ("boats_available", True),
-        ("rescue_team_ready", True),
-        ("medical_supplies_available", True),
-        ("dry_areas_available", True),
-        ("technicians_available", True),
-        ("communication_main_up", True),
-        ("backup_comm_available", True),
-        ("food_supplies_stocked", True),
-        ("community_alerted", False),
-        ("evacuation_started", False),
-        ("medical_kits_stocked", False),
-        ("rescue_team_predeployed", False),
-        ("routes_shifted", False)
-    }
-}
-goal_state1 = {
-    "action": ("rescue_team_work_done"),
-    "effects": {
-        ("people_safe", True),
-        ("rescue_team_predeployed", True),
-        ("rapid_response_prepared", True)
-    }
-}
-goal_state2 = {
-    "action": ("communication_team_work_done"),
-    "effects": {
-        ("communication_backup_operational", True),
-        ("routes_shifted", True)
-    }
-}
-goal_state3 = {
-    "action": ("medical_and_supplies_work_done"),
-    "effects": {
-        ("medical_kits_stocked", True),
-        ("supplies_ready", True)
-    }
-}
-goal_states = {
-    "goal_state1": goal_state1,
-    "goal_state2": goal_state2,
-    "goal_state3": goal_state3
-}
-
-monitor_forecast = {
-    "action": ("monitor_forecast"),
-    "preconditions": {
-        ("forecast_heavy_rain", True)
-    },
-    "effects": {
-        ("flood_risk_high", True),
-        ("forecast_confirmed", True)
-    }
-}
-predeploy_rescue_team = {
-    "action": ("predeploy_rescue_team"),
-    "preconditions": {
-        ("rescue_team_ready", True),
-        ("boats_available", True),
-        ("forecast_confirmed", True)
-    },
-    "effects": {
-        ("rescue_team_predeployed", True),
-        ("rapid_response_prepared", True)
-    }
-}
-stock_medical_kits_in_advance = {
-    "action": ("stock_medical_kits_in_advance"),
-    "preconditions": {
-        ("medical_supplies_available", True),
-        ("technicians_available", True)
-    },
-    "effects": {
-        ("medical_kits_stocked", True)
-    }
-}
-shift_route_due_to_bridge_risk = {
-    "action": ("shift_route_due_to_bridge_risk"),
-    "preconditions": {
-        ("bridges_weak", True),
-        ("roads_open", True)
-    },
-    "effects": {
-        ("routes_shifted", True),
-        ("bridge_area_closed", True)
-    }
-}
-evacuate_before_flood = {
-    "action": ("evacuate_before_flood"),
-    "preconditions": {
-        ("forecast_confirmed", True),
-        ("community_alerted", True),
-        ("dry_areas_available", True)
-    },
-    "effects": {
-        ("evacuation_started", True),
-        ("evacuation_completed", True),
-        ("people_safe", True),
-        ("dry_areas_available", False)##for precendence link
-    }
-}
-alert_community = {
-    "action": ("alert_community"),
-    "preconditions": {
-        ("forecast_confirmed", True),
-        ("community_alerted", False)
-    },
-    "effects": {
-        ("community_alerted", True)
-    }
-}
-establish_backup_communication = {
-    "action": ("establish_backup_communication"),
-    "preconditions": {
-        ("backup_comm_available", True),
-        ("technicians_available", True)
-    },
-    "effects": {
-        ("communication_backup_operational", True),
-        ("technicians_available", False)#for precedence link
 
-    }
-}
-stockpile_food_and_medicine = {
-    "action": ("stockpile_food_and_medicine"),
-    "preconditions": {
-        ("food_supplies_stocked", True),
-        ("dry_areas_available", True)
-    },
-    "effects": {
-        ("supplies_ready", True)
-    }
-}
-prepare_evacuation_centers = {
-    "action": ("prepare_evacuation_centers"),
-    "preconditions": {
-        ("dry_areas_available", True)
-    },
-    "effects": {
-        ("evacuation_centers_ready", True)
-    }
-}
-# -------------------------------
-# Group all actions for easy access
-# -------------------------------
-actions = {
-    "monitor_forecast": monitor_forecast,
-    "predeploy_rescue_team": predeploy_rescue_team,
-    "stock_medical_kits_in_advance": stock_medical_kits_in_advance,
-    "shift_route_due_to_bridge_risk": shift_route_due_to_bridge_risk,
-    "evacuate_before_flood": evacuate_before_flood,
-    "alert_community": alert_community,
-    "establish_backup_communication": establish_backup_communication,
-    "stockpile_food_and_medicine": stockpile_food_and_medicine,
-    "prepare_evacuation_centers": prepare_evacuation_centers,
-    "start":init_state,
-    "rescue_team_work_done":goal_state1,
-    "communication_team_work_done":goal_state2,
-    "medical_and_supplies_work_done":goal_state3
-}
+from disaster_ai.pop_module import (
+    P_flood, P_infra, init_state, goal_state1, goal_state2, goal_state3, goal_states,
+    monitor_forecast, predeploy_rescue_team, stock_medical_kits_in_advance,
+    shift_route_due_to_bridge_risk, evacuate_before_flood, alert_community,
+    establish_backup_communication, stockpile_food_and_medicine,
+    prepare_evacuation_centers, actions, initial_name, goal_names,
+    POP, POP_HEURISTICS, topological_sort, print_plan
+)
 
 
 causal_links = [
@@ -319,24 +151,13 @@ precedence_links = [
    
 ]
 
-print(causal_links)
-print("\n")
-print(precedence_links)
-
 
 
-
-import graphviz
-
-
-
-
-
-import networkx as nx
-import matplotlib.pyplot as plt
-
+# Visualization backends are imported inside each function, so that
+# importing this module (or disaster_ai.pop_module) stays cheap.
 def visualize_pop_network(actions, causal_links, precedence_links, filename="flood_POP_network.png"):
-    
+    import networkx as nx
+    import matplotlib.pyplot as plt
     
     G = nx.DiGraph()
 
@@ -392,17 +213,10 @@ def visualize_pop_network(actions, causal_links, precedence_links, filename="flo
 
 
 
-visualize_pop_network(actions, causal_links, precedence_links)
-
-
-
-import graphviz
-from pathlib import Path
-
 def visualize_pop_graphviz_better(actions, causal_links, precedence_links,
                                   filename_base="flood_POP_graph_better",
                                   prog="dot"):
-   
+    import graphviz
     
     
     team_map = {}  # node_name -> team label
@@ -479,14 +293,11 @@ def visualize_pop_graphviz_better(actions, causal_links, precedence_links,
     print(f"Saved: {png_path} and {pdf_path}")
 
 
-visualize_pop_graphviz_better(actions, causal_links, precedence_links)
 
-
-
-import json, webbrowser, os
-
-def write_vis_network_html(actions, causal_links, precedence_links, filename="flood_POP_interactive.html"):
-    
+def write_vis_network_html(actions, causal_links, precedence_links, filename="flood_POP_interactive.html",
+                           open_browser=True):
+    import json
+    import webbrowser
     nodes = []
     for name in actions.keys():
         lname = name.lower()
@@ -678,254 +489,57 @@ def write_vis_network_html(actions, causal_links, precedence_links, filename="fl
     with open(filename, "w", encoding="utf-8") as f:
         f.write(html)
 
-    path = os.path.realpath(filename)
-    webbrowser.open("file://" + path)
-    print(f"✅ Improved interactive HTML written to {filename} and opened in browser.")
-
-
-# Call it (will overwrite and open)
-write_vis_network_html(actions, causal_links, precedence_links, filename="flood_POP_interactive.html")
-
-
-from collections import deque
-import copy
-
-
-def eval_effect_value(val, P_flood, P_infra):
-    if callable(val):
-        try:
-            return bool(val(P_flood))
-        except TypeError:
-            try:
-                return bool(val(P_infra))
-            except TypeError:
-                try:
-                    return bool(val(P_flood, P_infra))
-                except Exception:
-                    return None
+    if open_browser:
+        path = os.path.realpath(filename)
+        webbrowser.open("file://" + path)
+        print(f"✅ Improved interactive HTML written to {filename} and opened in browser.")
     else:
-        return val
-
-def effect_matches(effect, desired_fact, P_flood, P_infra):
-    if effect[0] != desired_fact[0]:
-        return False
-    v = eval_effect_value(effect[1], P_flood, P_infra)
-    return v is not None and v == desired_fact[1]
+        print(f"✅ Improved interactive HTML written to {filename}")
 
 
-def has_cycle(ordering):
-    
-    adj = {}
-    for a,b in ordering:
-        adj.setdefault(a, set()).add(b)
-        adj.setdefault(b, set())
-    visited, stack = set(), set()
-    def dfs(u):
-        if u in stack: return True
-        if u in visited: return False
-        stack.add(u)
-        for v in adj.get(u, ()):
-            if dfs(v): return True
-        stack.remove(u); visited.add(u)
-        return False
-    for n in adj:
-        if dfs(n): return True
-    return False
-
-def topological_sort(ordering, all_nodes):
-    adj = {n:set() for n in all_nodes}
-    indeg = {n:0 for n in all_nodes}
-    for a,b in ordering:
-        if a in adj and b in adj:
-            adj[a].add(b); indeg[b]+=1
-    q = deque([n for n in all_nodes if indeg[n]==0])
-    out=[]
-    while q:
-        u=q.popleft(); out.append(u)
-        for v in list(adj[u]):
-            indeg[v]-=1
-            if indeg[v]==0:
-                q.append(v)
-    for n in all_nodes:
-        if n not in out:
-            out.append(n)
-    return out
-
-
-def Make_Minimal_Plan(initial_name, goal_action_names, operators):
-    plan = {
-        "actions": set([initial_name]) | set(goal_action_names),
-        "ordering": set((initial_name, g) for g in goal_action_names),
-        "causal_links": [],            
-        "open_preconds": deque()     
-    }
-    for g in goal_action_names:
-        for ef in operators[g].get("effects", set()):
-            plan["open_preconds"].append((g, ef))
-    return plan
-
-
-def Select_Subgoal(plan):
-    if not plan.get("open_preconds"):
-        return None
-    return plan["open_preconds"].popleft()
 
+VIEWS = {
+    "png": lambda args: visualize_pop_network(actions, causal_links, precedence_links),
+    "graphviz": lambda args: visualize_pop_graphviz_better(actions, causal_links, precedence_links),
+    "html": lambda args: write_vis_network_html(actions, causal_links, precedence_links,
+                                                open_browser=not args.no_browser),
+}
 
-def Solution(plan, init_state, operators, P_flood, P_infra):
-   
-    if plan.get("open_preconds"):
-        return False
-    if has_cycle(plan.get("ordering", set())):
-        return False
-    
-    for prov, fact, cons in plan.get("causal_links", []):
-        if prov == "start":
-            # check init state
-            ok = False
-            for ef in init_state.get("effects", set()):
-                if effect_matches(ef, fact, P_flood, P_infra):
-                    ok = True; break
-            if not ok: return False
-        else:
-            op = operators.get(prov)
-            if not op: return False
-            if not any(effect_matches(ef, fact, P_flood, P_infra) for ef in op.get("effects", set())):
-                return False
-    return True
 
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Flood-preparedness partial-order planner")
+    parser.add_argument("--p-flood", type=float, default=P_flood)
+    parser.add_argument("--p-infra", type=float, default=P_infra)
+    parser.add_argument("--strategy", choices=("dfs", "best_first"), default="dfs")
+    parser.add_argument("--heuristic", choices=sorted(POP_HEURISTICS), default="open")
+    parser.add_argument("--flaw", choices=("fifo", "least_commitment"), default="fifo")
+    parser.add_argument("--max-nodes", type=int, default=20000)
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--show-links", action="store_true",
+                        help="print the hand-drawn causal and precedence links")
+    parser.add_argument("--viz", action="append", choices=sorted(VIEWS), default=[],
+                        help="render the POP network (repeatable)")
+    parser.add_argument("--no-browser", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.show_links:
+        print(causal_links)
+        print("\n")
+        print(precedence_links)
+    for view in args.viz:
+        VIEWS[view](args)
+
+    plan = POP(initial_name, goal_names, actions, init_state, args.p_flood, args.p_infra,
+               max_nodes=args.max_nodes, debug=args.debug, strategy=args.strategy,
+               heuristic=args.heuristic, flaw=args.flaw, time_limit=args.time_limit,
+               partial=args.time_limit is not None)
+    print_plan(plan)
+    return plan
 
-def find_providers(fact, operators, plan, init_name, init_state, P_flood, P_infra):
-    provs = []
-    
-    for ef in init_state.get("effects", set()):
-        if effect_matches(ef, fact, P_flood, P_infra):
-            provs.append(init_name); break
-    
-    for a in plan["actions"]:
-        if a == init_name: continue
-        op = operators.get(a)
-        if op and any(effect_matches(ef, fact, P_flood, P_infra) for ef in op.get("effects", set())):
-            provs.append(a)
-    
-    for name, op in operators.items():
-        if name in plan["actions"]: continue
-        if any(effect_matches(ef, fact, P_flood, P_infra) for ef in op.get("effects", set())):
-            provs.append(name)
-    return provs
 
 
-def Choose_Operator(plan, operators, S, c, init_name, init_state, P_flood, P_infra):
-    
-    consumer = S; fact = c
-    providers = find_providers(fact, operators, plan, init_name, init_state, P_flood, P_infra)
-    children = []
-    for prov in providers:
-        newplan = copy.deepcopy(plan)
-        
-        newplan.setdefault("causal_links", []).append((prov, fact, consumer))
-        
-        newplan.setdefault("ordering", set()).add((prov, consumer))
-        
-        if prov not in newplan["actions"]:
-            newplan["actions"].add(prov)
-            newplan["ordering"].add((init_name, prov))
-            for pre in operators[prov].get("preconditions", set()):
-                newplan.setdefault("open_preconds", deque()).append((prov, pre))
-        children.append(newplan)
-    return children
-
-
-def operator_negates(op, fact, P_flood, P_infra):
-    if not op: return False
-    for ef in op.get("effects", ()):
-        if ef[0] == fact[0]:
-            v = eval_effect_value(ef[1], P_flood, P_infra)
-            if v is not None and v != fact[1]:
-                return True
-    return False
-
-def Resolve_Threats(plan, operators, P_flood, P_infra):
-    ordering = plan.setdefault("ordering", set())
-    for (prov, fact, cons) in list(plan.get("causal_links", [])):
-        for act in list(plan["actions"]):
-            if act == prov or act == cons:
-                continue
-            if operator_negates(operators.get(act), fact, P_flood, P_infra):
-                
-                ordering.add((act, prov))
-                if not has_cycle(ordering):
-                    continue
-                ordering.remove((act, prov)) 
-               
-                ordering.add((cons, act))
-                if not has_cycle(ordering):
-                    continue
-                ordering.remove((cons, act))
-              
-                return False
-    return True
-
-
-def POP(initial_name, goal_action_names, operators, init_state, P_flood, P_infra, max_nodes=20000, debug=False):
-
-    root = Make_Minimal_Plan(initial_name, goal_action_names, operators)
-    stack = [root]
-    nodes = 0
-
-    while stack and nodes < max_nodes:
-        nodes += 1
-        plan = stack.pop()
-        if debug:
-            print(f"[node {nodes}] actions={plan['actions']}, open_preconds={len(plan['open_preconds'])}")
-        if Solution(plan, init_state, operators, P_flood, P_infra):
-            if debug: print("Solution found.")
-            return plan
-        sub = Select_Subgoal(plan)
-        if sub is None:
-            
-            if debug: print("No subgoal but not a solution, skipping node.")
-            continue
-        S, c = sub
-        if debug: print(f" Selected subgoal: {S}, {c}")
-        children = Choose_Operator(plan, operators, S, c, initial_name, init_state, P_flood, P_infra)
-        if not children:
-            if debug: print("  No providers for this subgoal -> dead end")
-            continue
-        
-        for child in children:
-            ok = Resolve_Threats(child, operators, P_flood, P_infra)
-            if not ok:
-                if debug: print("  Child had unresolvable threat -> skip")
-                continue
-            stack.append(child)
- 
-    return None
-
-
-def print_plan(plan):
-    if plan is None:
-        print("No plan found.")
-        return
-    print("\n===== PLAN =====")
-    print("Actions (unordered):")
-    for a in plan["actions"]:
-        print(" -", a)
-    print("\nCausal links:")
-    for prov, fact, cons in plan.get("causal_links", []):
-        print(f"  ({prov}) -- {fact} --> ({cons})")
-    print("\nOrdering constraints:")
-    for b,a in plan.get("ordering", set()):
-        print("  ", b, "->", a)
-    print("\nOne valid linearization:")
-    seq = topological_sort(plan.get("ordering", set()), list(plan["actions"]))
-    for i,s in enumerate(seq, 1):
-        print(f"  {i}. {s}")
-    print("===============\n")
-
-
-initial_name = "start"
-goal_names = [n for n in ["rescue_team_work_done","communication_team_work_done","medical_and_supplies_work_done"] if n in actions]
-
-
-plan = POP(initial_name, goal_names, actions, init_state, P_flood, P_infra, max_nodes=20000, debug=True)
-print_plan(plan)
+if __name__ == "__main__":
+    main()
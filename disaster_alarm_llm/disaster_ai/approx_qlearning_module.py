@@ -0,0 +1,193 @@
+
+import numpy as np
+
+from disaster_ai.qlearning_module import ACTIONS, ACTION_INDEX, reward, RISK_LEVELS
+
+
+# Continuous inputs, in the order they appear in a feature vector.
+FEATURES = ("Flood", "Bridge_Collapse", "Landslide", "Water_Borne_Disease", "Resources")
+
+# Tiled feature groups: every feature on its own plus flood x resources jointly.
+DEFAULT_GROUPS = [(i,) for i in range(len(FEATURES))] + [(0, len(FEATURES) - 1)]
+
+
+def features_from_bayes(bayes, resources=1.0):
+    """
+    Feature vector(s) from run_bayesian_module output ({target: prob}) and
+    the available resource fraction. Missing posteriors default to 0.
+    """
+    probs = [np.asarray(bayes.get(name, 0.0), dtype=np.float64) for name in FEATURES[:-1]]
+    return np.stack(np.broadcast_arrays(*probs, np.asarray(resources, dtype=np.float64)), axis=-1)
+
+
+class TileCoder:
+    """
+    Hashed tile coding over a box [low, high]^d.
+
+    Features are tiled in groups (tuples of feature indices); each group
+    gets n_tilings offset grids and each grid contributes one active tile.
+    Tiling small groups instead of the full d-dimensional box keeps the
+    number of weights linear in the number of features. Tile coordinates
+    are hashed into memory_size entries, so memory is fixed no matter how
+    finely the inputs are resolved.
+    """
+
+    def __init__(self, low, high, groups=None, n_tilings=8, tiles_per_dim=10,
+                 memory_size=4096, seed=0):
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        d = self.low.size
+        self.groups = [tuple(g) for g in (groups or [(i,) for i in range(d)])]
+        self.n_tilings = n_tilings
+        self.n_active = n_tilings * len(self.groups)
+        self.memory_size = memory_size
+        self.scale = tiles_per_dim / (self.high - self.low)
+
+        rng = np.random.default_rng(seed)
+        self.offsets = rng.random((n_tilings, d))
+        self._mult = (rng.integers(1, 2 ** 31, size=d + 1) * 2 + 1).astype(np.uint64)
+        self._tiling_key = [
+            (np.arange(n_tilings, dtype=np.uint64) + np.uint64(k * n_tilings)) * self._mult[d]
+            for k in range(len(self.groups))
+        ]
+
+    def active(self, X):
+        """(N, d) inputs -> (N, n_active) indices of the active tiles."""
+        z = (np.clip(X, self.low, self.high) - self.low) * self.scale
+        coords = np.floor(z[:, None, :] + self.offsets).astype(np.int64).astype(np.uint64)
+        keys = []
+        for g, tiling_key in zip(self.groups, self._tiling_key):
+            g = list(g)
+            keys.append((coords[:, :, g] * self._mult[g]).sum(axis=-1) + tiling_key)
+        key = np.concatenate(keys, axis=1)
+        return (key % np.uint64(self.memory_size)).astype(np.int64)
+
+
+class TileCodedQ:
+    """Linear Q-function over hashed tile features: Q(x, a) = sum of W[tiles(x), a]."""
+
+    def __init__(self, coder, n_actions=len(ACTIONS)):
+        self.coder = coder
+        self.W = np.zeros((coder.memory_size, n_actions))
+
+    def values(self, X, idx=None):
+        idx = self.coder.active(X) if idx is None else idx
+        return self.W[idx].sum(axis=1)
+
+    def update(self, X, a, targets, alpha, idx=None):
+        """
+        Batched semi-gradient TD step. Gradients of samples sharing a tile
+        are summed (bincount) rather than overwritten.
+        """
+        idx = self.coder.active(X) if idx is None else idx
+        n_actions = self.W.shape[1]
+        q = self.W[idx, a[:, None]].sum(axis=1)
+        step = (alpha / self.coder.n_active) * (targets - q)
+        flat = (idx * n_actions + a[:, None]).ravel()
+        grad = np.bincount(flat, weights=np.repeat(step, idx.shape[1]),
+                           minlength=self.W.size)
+        self.W += grad.reshape(self.W.shape)
+
+    def greedy(self, X):
+        q = self.values(np.atleast_2d(X))
+        a = q.argmax(axis=1)
+        return np.array(ACTIONS)[a], q[np.arange(len(a)), a]
+
+
+class ContinuousDisasterEnv:
+    """
+    Continuous counterpart of the qlearning environment. The state is the
+    FEATURES vector; actions move P(Flood) and resources the same way
+    next_state moves the discrete risk/resource levels, plus noise, and the
+    other posteriors drift as exogenous inputs. Rewards reuse
+    qlearning_module.reward on the bucketed risk level.
+    """
+
+    # per action: (flood drift, resource drift)
+    DRIFT = {
+        "EvacuateNow": (-0.10, -0.30),
+        "WaitAndObserve": (+0.10, +0.10),
+        "SendDrone": (-0.15, -0.10),
+        "PreDeployTeams": (-0.10, -0.30),
+    }
+
+    def __init__(self, noise=0.03, risk_edges=(1 / 3, 2 / 3)):
+        self.noise = noise
+        self.risk_edges = risk_edges
+        self.flood_drift = np.array([self.DRIFT[a][0] for a in ACTIONS])
+        self.res_drift = np.array([self.DRIFT[a][1] for a in ACTIONS])
+        self.reward_table = np.array([[reward(f"{r}_MidRes", a) for a in ACTIONS]
+                                      for r in RISK_LEVELS])
+
+    def reset(self, n, rng):
+        return rng.random((n, len(FEATURES)))
+
+    def step(self, X, a, rng):
+        risk = np.digitize(X[:, 0], self.risk_edges)
+        r = self.reward_table[risk, a]
+
+        # evacuation only lowers risk once it is high
+        flood_drift = np.where((a == ACTION_INDEX["EvacuateNow"]) & (risk < 2),
+                               0.0, self.flood_drift[a])
+
+        X = X + self.noise * rng.standard_normal(X.shape)
+        X[:, 0] += flood_drift
+        X[:, -1] += self.res_drift[a]
+        return np.clip(X, 0.0, 1.0), r
+
+
+def train_tile_coded_q(
+        episodes=20000,
+        n_envs=256,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.1,
+        max_steps=20,
+        seed=None,
+        env=None,
+        **coder_kwargs):
+    """
+    Q-learning with a tile-coded linear Q-function on continuous features,
+    n_envs environments per batched update.
+    """
+    env = env or ContinuousDisasterEnv()
+    rng = np.random.default_rng(seed)
+    d = len(FEATURES)
+    coder_kwargs.setdefault("groups", DEFAULT_GROUPS)
+    model = TileCodedQ(TileCoder(np.zeros(d), np.ones(d), **coder_kwargs))
+    n_actions = model.W.shape[1]
+
+    for _ in range(-(-episodes // n_envs)):
+        X = env.reset(n_envs, rng)
+        idx = model.coder.active(X)
+
+        for __ in range(max_steps):
+            q = model.values(X, idx)
+            explore = rng.random(n_envs) < epsilon
+            a = np.where(explore, rng.integers(n_actions, size=n_envs), q.argmax(axis=1))
+
+            X_next, r = env.step(X, a, rng)
+            idx_next = model.coder.active(X_next)
+            targets = r + gamma * model.values(X_next, idx_next).max(axis=1)
+            model.update(X, a, targets, alpha, idx)
+            X, idx = X_next, idx_next
+
+    return model
+
+
+def run_approx_qlearning_module(bayes=None, resources=0.5, seed=0):
+    """
+    Train on continuous inputs and return the greedy action for the given
+    Bayesian posteriors and resource fraction.
+    """
+    bayes = bayes or {"Flood": 0.55, "Bridge_Collapse": 0.80,
+                      "Landslide": 0.35, "Water_Borne_Disease": 0.25}
+    model = train_tile_coded_q(seed=seed)
+    names, _ = model.greedy(features_from_bayes(bayes, resources))
+    return str(names[0])
+
+
+
+if __name__ == "__main__":
+    action = run_approx_qlearning_module()
+    print("\nTile-coded RL Action:", action)
@@ -0,0 +1,340 @@
+
+import hashlib
+import operator
+import os
+import pickle
+import re
+
+
+COMPILER_VERSION = 1
+
+COMPARATORS = {">=": operator.ge, ">": operator.gt, "<=": operator.le, "<": operator.lt}
+
+# POP binds effect lambdas by parameter name (pop_module._call_effect), so
+# each parameter gets a lambda whose argument carries that name.
+_CONDITION_LAMBDAS = {
+    "P_flood": lambda cmp, v: lambda P_flood: cmp(P_flood, v),
+    "P_infra": lambda cmp, v: lambda P_infra: cmp(P_infra, v),
+}
+
+
+class DomainSyntaxError(ValueError):
+    pass
+
+
+# ------------------------------------------------------------------
+# S-expression reader
+# ------------------------------------------------------------------
+_TOKEN = re.compile(r";[^\n]*|([()])|([^\s()]+)")
+
+
+def parse_sexpr(text):
+    """Nested lists of atoms; ';' starts a comment."""
+    stack = [[]]
+    for m in _TOKEN.finditer(text):
+        paren, atom = m.groups()
+        if paren == "(":
+            stack.append([])
+        elif paren == ")":
+            if len(stack) == 1:
+                raise DomainSyntaxError("unbalanced ')'")
+            done = stack.pop()
+            stack[-1].append(done)
+        elif atom is not None:
+            stack[-1].append(atom)
+    if len(stack) != 1:
+        raise DomainSyntaxError("unbalanced '('")
+    return stack[0]
+
+
+# ------------------------------------------------------------------
+# Compiled, integer-indexed domain
+# ------------------------------------------------------------------
+class CompiledDomain:
+    """
+    Domain + problem with every fact interned to an id.
+
+        facts[i]                      fact name of id i
+        action_names[a]               operator names, in file order
+        pre_pos[a], pre_neg[a]        int bitsets of facts required true / false
+        add[a], dele[a]               int bitsets of facts made true / false
+        params                        {parameter: default value}
+        init                          [(fact id, value, condition or None)]
+                                      condition is (parameter, comparator, threshold)
+        goals                         {goal name: (pos bitset, neg bitset)}
+    """
+
+    def __init__(self, name, problem):
+        self.name = name
+        self.problem = problem
+        self.facts = []
+        self.fact_id = {}
+        self.action_names = []
+        self.pre_pos, self.pre_neg, self.add, self.dele = [], [], [], []
+        self.params = {}
+        self.init = []
+        self.goals = {}
+
+    def intern(self, fact):
+        i = self.fact_id.get(fact)
+        if i is None:
+            i = self.fact_id[fact] = len(self.facts)
+            self.facts.append(fact)
+        return i
+
+    def names(self, bits):
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(self.facts[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    def holds(self, condition, values):
+        if condition is None:
+            return True
+        param, cmp, threshold = condition
+        return COMPARATORS[cmp](values.get(param, self.params.get(param)), threshold)
+
+
+def _literals(expr, where):
+    """(pos facts, neg facts) of '(and ...)', a single literal or '()'."""
+    if not expr:
+        return [], []
+    if expr[0] == "and":
+        items = expr[1:]
+    else:
+        items = [expr]
+    pos, neg = [], []
+    for lit in items:
+        if not isinstance(lit, list) or not lit:
+            raise DomainSyntaxError(f"{where}: expected a literal, got {lit!r}")
+        if lit[0] == "not":
+            if len(lit) != 2 or not isinstance(lit[1], list) or len(lit[1]) != 1:
+                raise DomainSyntaxError(f"{where}: malformed {lit!r}")
+            neg.append(lit[1][0])
+        elif len(lit) == 1 and isinstance(lit[0], str):
+            pos.append(lit[0])
+        else:
+            raise DomainSyntaxError(f"{where}: unsupported literal {lit!r}")
+    return pos, neg
+
+
+def _header(tree, kind, path):
+    if len(tree) != 1 or not isinstance(tree[0], list) or tree[0][:1] != ["define"]:
+        raise DomainSyntaxError(f"{path}: expected a single (define ...) form")
+    form = tree[0]
+    if len(form) < 2 or not isinstance(form[1], list) or form[1][:1] != [kind]:
+        raise DomainSyntaxError(f"{path}: expected (define ({kind} NAME) ...)")
+    return form[1][1], form[2:]
+
+
+def compile_domain_text(domain_text, problem_text, domain_path="<domain>",
+                        problem_path="<problem>"):
+    domain_name, sections = _header(parse_sexpr(domain_text), "domain", domain_path)
+    problem_name, psections = _header(parse_sexpr(problem_text), "problem", problem_path)
+    cd = CompiledDomain(domain_name, problem_name)
+
+    def mask(facts):
+        m = 0
+        for f in facts:
+            m |= 1 << cd.intern(f)
+        return m
+
+    for sec in sections:
+        if sec[:1] != [":action"] or len(sec) < 2:
+            raise DomainSyntaxError(f"{domain_path}: unexpected section {sec[:1]}")
+        name = sec[1]
+        fields = dict(zip(sec[2::2], sec[3::2]))
+        where = f"{domain_path}: action {name}"
+        pre_pos, pre_neg = _literals(fields.get(":precondition", []), where)
+        eff_pos, eff_neg = _literals(fields.get(":effect", []), where)
+        cd.action_names.append(name)
+        cd.pre_pos.append(mask(pre_pos))
+        cd.pre_neg.append(mask(pre_neg))
+        cd.add.append(mask(eff_pos))
+        cd.dele.append(mask(eff_neg))
+    if len(set(cd.action_names)) != len(cd.action_names):
+        raise DomainSyntaxError(f"{domain_path}: duplicate action names")
+
+    for sec in psections:
+        head = sec[0] if sec else None
+        where = f"{problem_path}: {head}"
+        if head == ":domain":
+            if sec[1] != domain_name:
+                raise DomainSyntaxError(f"{where}: problem is for domain {sec[1]!r}")
+        elif head == ":parameters":
+            for item in sec[1:]:
+                cd.params[item[0]] = float(item[1])
+        elif head == ":init":
+            for lit in sec[1:]:
+                cond, lits = None, [lit]
+                if lit[:1] == ["when"]:
+                    cmp, param, threshold = lit[1]
+                    if cmp not in COMPARATORS:
+                        raise DomainSyntaxError(f"{where}: unknown comparator {cmp!r}")
+                    cond, lits = (param, cmp, float(threshold)), lit[2:]
+                pos, neg = _literals(["and", *lits], where)
+                if cond is not None and neg:
+                    # facts are false unless the init says otherwise
+                    raise DomainSyntaxError(f"{where}: (not ...) inside (when ...)")
+                cd.init += [(cd.intern(f), True, cond) for f in pos]
+                cd.init += [(cd.intern(f), False, cond) for f in neg]
+        elif head == ":goal":
+            name, expr = (sec[1], sec[2]) if len(sec) == 3 else ("goal", sec[1])
+            pos, neg = _literals(expr, where)
+            cd.goals[name] = (mask(pos), mask(neg))
+        else:
+            raise DomainSyntaxError(f"{where}: unexpected section")
+
+    for _, _, cond in cd.init:
+        if cond is not None and cond[0] not in cd.params:
+            raise DomainSyntaxError(f"{problem_path}: undeclared parameter {cond[0]!r}")
+    return cd
+
+
+# ------------------------------------------------------------------
+# Disk cache keyed by file content
+# ------------------------------------------------------------------
+def _file_key(*paths):
+    h = hashlib.sha256(f"v{COMPILER_VERSION}".encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def load_domain(domain_path="data/flood_domain.pddl", problem_path="data/flood_problem.pddl",
+                cache_dir="data/.domain_cache"):
+    """
+    CompiledDomain for a domain/problem file pair. The compiled table is
+    pickled under cache_dir, named by a hash of both files' contents (and
+    the compiler version), so edited files are recompiled automatically.
+    cache_dir=None disables the cache.
+    """
+    key = _file_key(domain_path, problem_path) if cache_dir else None
+    if key:
+        cached = os.path.join(cache_dir, key + ".pkl")
+        if os.path.exists(cached):
+            with open(cached, "rb") as f:
+                return pickle.load(f)
+
+    with open(domain_path, encoding="utf-8") as f:
+        domain_text = f.read()
+    with open(problem_path, encoding="utf-8") as f:
+        problem_text = f.read()
+    cd = compile_domain_text(domain_text, problem_text, domain_path, problem_path)
+
+    if key:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cached + f".{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(cd, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cached)
+    return cd
+
+
+# ------------------------------------------------------------------
+# Engine adapters
+# ------------------------------------------------------------------
+def to_pop(cd, initial_name="start"):
+    """
+    (operators, init_state, initial_name, goal_names) in pop_module form.
+    Conditional init facts become lambdas of their parameter, so POP and
+    ScenarioPlanner resolve them per P_flood / P_infra as before.
+    """
+    def facts(pos, neg):
+        return {(f, True) for f in cd.names(pos)} | {(f, False) for f in cd.names(neg)}
+
+    effects = set()
+    for fid, value, cond in cd.init:
+        if cond is None:
+            effects.add((cd.facts[fid], value))
+            continue
+        param, cmp, threshold = cond
+        if param not in _CONDITION_LAMBDAS:
+            raise ValueError(f"POP only takes P_flood / P_infra, not {param!r}")
+        effects.add((cd.facts[fid], _CONDITION_LAMBDAS[param](COMPARATORS[cmp], threshold)))
+    init_state = {"action": initial_name, "effects": effects}
+
+    operators = {}
+    for a, name in enumerate(cd.action_names):
+        operators[name] = {
+            "action": name,
+            "preconditions": facts(cd.pre_pos[a], cd.pre_neg[a]),
+            "effects": facts(cd.add[a], cd.dele[a]),
+        }
+    operators[initial_name] = init_state
+    for name, (pos, neg) in cd.goals.items():
+        operators[name] = {"action": name, "effects": facts(pos, neg)}
+    return operators, init_state, initial_name, list(cd.goals)
+
+
+def to_strips(cd, **values):
+    """
+    (actions, init, goals) in graphplan_module.get_actions() form, with
+    parameters taken from `values` (defaults from the problem file).
+    STRIPS has no negative literals, so every fact f that is required
+    false gets a complementary fact "not_f" maintained by the effects.
+    """
+    negated = 0
+    for m in cd.pre_neg:
+        negated |= m
+    for _, neg in cd.goals.values():
+        negated |= neg
+
+    def comp(bits):
+        return {"not_" + f for f in cd.names(bits & negated)}
+
+    actions = {}
+    for a, name in enumerate(cd.action_names):
+        actions[name] = {
+            "pre": set(cd.names(cd.pre_pos[a])) | comp(cd.pre_neg[a]),
+            "add": set(cd.names(cd.add[a])) | comp(cd.dele[a]),
+            "del": set(cd.names(cd.dele[a])) | comp(cd.add[a]),
+        }
+
+    true = set()
+    for fid, value, cond in cd.init:
+        if value and cd.holds(cond, values):
+            true.add(fid)
+    init = {cd.facts[i] for i in true}
+    init |= {"not_" + cd.facts[i] for i in range(len(cd.facts))
+             if negated >> i & 1 and i not in true}
+
+    goals = set()
+    for pos, neg in cd.goals.values():
+        goals |= set(cd.names(pos)) | comp(neg)
+    return actions, init, goals
+
+
+def run_domain_module(domain_path="data/flood_domain.pddl",
+                      problem_path="data/flood_problem.pddl", engine="pop", **values):
+    """
+    Compile (or load from cache) a domain/problem pair and solve it.
+    engine: "pop" -> plan dict, "graphplan" / "forward" -> list of actions
+    """
+    cd = load_domain(domain_path, problem_path)
+    params = {**cd.params, **values}
+    if engine == "pop":
+        from disaster_ai.pop_module import POP
+        operators, init_state, initial_name, goal_names = to_pop(cd)
+        return POP(initial_name, goal_names, operators, init_state,
+                   params.get("P_flood"), params.get("P_infra"))
+
+    actions, init, goals = to_strips(cd, **params)
+    if engine == "graphplan":
+        from disaster_ai.graphplan_module import graphplan, extract_action_list
+        return extract_action_list(graphplan(init, goals, actions))
+    if engine == "forward":
+        from disaster_ai.forward_search_module import forward_plan
+        return forward_plan(init, goals, actions) or []
+    raise ValueError(f"unknown engine {engine!r}")
+
+
+
+if __name__ == "__main__":
+    from disaster_ai.pop_module import print_plan
+
+    print_plan(run_domain_module())
+    print("GraphPlan actions:", run_domain_module(engine="graphplan"))
@@ -0,0 +1,157 @@
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from disaster_ai.qlearning_module import ACTIONS, ACTION_INDEX, STATES, reward, train_qlearning
+from disaster_ai.simulation_module import FactoredDisasterEnv
+from disaster_ai.mdp_module import value_iteration
+
+
+class TablePolicy:
+    """
+    Picklable policy wrapper over an array, so it can cross process
+    boundaries:
+        (n_states,)          action id per environment state
+        (n_states, A)        greedy over a Q-table of the environment
+        (len(STATES), A)     greedy over a qlearning_module Q-table,
+                             looked up through env.coarse_state
+    """
+
+    def __init__(self, table, coarse=False):
+        self.table = np.asarray(table)
+        self.coarse = coarse
+        if self.table.ndim == 2:
+            self.table = self.table.argmax(axis=1)
+
+    def __call__(self, env, s):
+        return self.table[env.coarse_state(s) if self.coarse else s]
+
+
+class FixedAction:
+    def __init__(self, action):
+        self.action = ACTION_INDEX[action] if isinstance(action, str) else int(action)
+
+    def __call__(self, env, s):
+        return np.full(s.shape, self.action)
+
+
+def as_policy(env, policy):
+    """Normalise any supported policy spec to a callable policy(env, s)."""
+    if callable(policy):
+        return policy
+    if isinstance(policy, str):
+        return FixedAction(policy)
+    table = np.asarray(policy)
+    coarse = table.shape[0] == len(STATES) and table.shape[0] != env.n_states
+    return TablePolicy(table, coarse=coarse)
+
+
+def rule_policy():
+    """Fixed rule: the action with the best immediate qlearning reward per coarse state."""
+    table = np.array([[reward(s, a) for a in ACTIONS] for s in STATES])
+    return TablePolicy(table, coarse=True)
+
+
+def rollout_returns(env, policy, n_episodes, gamma=1.0, seed=None, max_steps=None):
+    """
+    Run n_episodes in lock-step until landfall.
+    Returns the discounted return of every episode.
+    """
+    policy = as_policy(env, policy)
+    rng = np.random.default_rng(seed)
+    s = env.reset(n_episodes, rng)
+    total = np.zeros(n_episodes)
+    discount = 1.0
+    for _ in range(max_steps or env.horizon):
+        s, r, done = env.step(s, policy(env, s), rng)
+        total += discount * r
+        discount *= gamma
+        if done.all():
+            break
+    return total
+
+
+def _rollout_chunk(job):
+    env, policy, n, gamma, seed = job
+    return rollout_returns(env, policy, n, gamma, seed)
+
+
+def summarize_returns(returns, tail=0.05):
+    cutoff = np.quantile(returns, tail)
+    return {
+        "n": int(returns.size),
+        "mean": float(returns.mean()),
+        "std": float(returns.std()),
+        "var": float(returns.var()),
+        "stderr": float(returns.std() / np.sqrt(returns.size)),
+        "tail_quantile": float(cutoff),
+        # expected return over the worst `tail` fraction (CVaR)
+        "tail_mean": float(returns[returns <= cutoff].mean()),
+    }
+
+
+def evaluate_policy(env, policy, n_episodes=100_000, gamma=1.0, seed=None,
+                    processes=1, tail=0.05):
+    """
+    Monte-Carlo evaluation of `policy` on `env`. With processes > 1 the
+    episodes are split across a process pool with independent seed
+    streams (policy must then be picklable, e.g. TablePolicy).
+    processes=None uses every CPU.
+    """
+    policy = as_policy(env, policy)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, n_episodes))
+    if processes == 1:
+        returns = rollout_returns(env, policy, n_episodes, gamma, seed)
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(processes)
+        sizes = [n_episodes // processes + (i < n_episodes % processes)
+                 for i in range(processes)]
+        jobs = [(env, policy, n, gamma, ss) for n, ss in zip(sizes, seeds)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            returns = np.concatenate(list(pool.map(_rollout_chunk, jobs)))
+    return summarize_returns(returns, tail)
+
+
+def should_deploy(candidate, baseline, margin=0.0):
+    """
+    Gate for a new Q-table: its expected return and its tail must both be
+    no worse than the baseline's (minus margin).
+    """
+    return (candidate["mean"] >= baseline["mean"] - margin
+            and candidate["tail_quantile"] >= baseline["tail_quantile"] - margin)
+
+
+def run_evaluation_module(n_episodes=100_000, seed=0, Q=None, bayes=None):
+    """
+    Evaluate the Q-learning policy against the exact MDP optimum and fixed
+    rules on the factored environment.
+    Returns: {policy name: stats}
+    """
+    env = FactoredDisasterEnv.from_posteriors(bayes) if bayes else FactoredDisasterEnv()
+    if Q is None:
+        Q = train_qlearning(seed=seed)
+    _, optimal, _ = value_iteration(env.to_mdp(), gamma=1.0, max_iter=env.horizon + 1)
+
+    policies = {
+        "qlearning": TablePolicy(Q, coarse=True),
+        "value_iteration": TablePolicy(optimal),
+        "reward_rule": rule_policy(),
+        "always_evacuate": FixedAction("EvacuateNow"),
+    }
+    # same seed for every policy: common random numbers
+    return {name: evaluate_policy(env, p, n_episodes, seed=seed)
+            for name, p in policies.items()}
+
+
+
+if __name__ == "__main__":
+    results = run_evaluation_module()
+    print("\nPolicy evaluation (100k rollouts):")
+    for name, st in results.items():
+        print(f"  {name:16s} mean={st['mean']:8.2f} std={st['std']:7.2f} "
+              f"p5={st['tail_quantile']:8.2f} cvar5={st['tail_mean']:8.2f}")
+    print("\nDeploy Q-table:", should_deploy(results["qlearning"], results["reward_rule"]))
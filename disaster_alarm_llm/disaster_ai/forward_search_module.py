@@ -0,0 +1,295 @@
+
+import heapq
+import itertools
+
+from disaster_ai.graphplan_module import get_actions, get_initial_state, get_goals, bits
+
+
+class StripsTask:
+    """
+    A get_actions()-style STRIPS domain compiled once to integer ids.
+
+    States, preconditions and effects are int bitsets over the interned
+    facts; the relaxed-plan heuristics walk plain lists of ids
+    (pre_ids, add_ids, consumers) so no set or string is touched per node.
+    Each action is also listed under its least shared precondition fact
+    (watch), so applicable() only tests actions watching a true fact.
+    """
+
+    def __init__(self, actions, init, goals):
+        fact_names = set(init) | set(goals)
+        for a in actions.values():
+            fact_names |= a["pre"] | a["add"] | a["del"]
+        self.fact_names = sorted(fact_names)
+        self.fact_id = {f: i for i, f in enumerate(self.fact_names)}
+        self.n_facts = len(self.fact_names)
+
+        self.action_names = list(actions)
+        self.pre = [self._mask(a["pre"]) for a in actions.values()]
+        self.add = [self._mask(a["add"]) for a in actions.values()]
+        self.dele = [self._mask(a["del"]) for a in actions.values()]
+        self.cost = [a.get("cost", 1) for a in actions.values()]
+
+        self.pre_ids = [tuple(bits(p)) for p in self.pre]
+        self.add_ids = [tuple(bits(e)) for e in self.add]
+        self.n_pre = [len(p) for p in self.pre_ids]
+        self.no_pre = [a for a, n in enumerate(self.n_pre) if n == 0]
+        self.consumers = [[] for _ in range(self.n_facts)]
+        for a, pre in enumerate(self.pre_ids):
+            for f in pre:
+                self.consumers[f].append(a)
+        self.watchers = [[] for _ in range(self.n_facts)]
+        for a, pre in enumerate(self.pre_ids):
+            if pre:
+                self.watchers[min(pre, key=lambda f: len(self.consumers[f]))].append(a)
+
+        self.init = self._mask(init)
+        self.goals = self._mask(goals)
+        self.goal_ids = tuple(bits(self.goals))
+
+    def _mask(self, facts):
+        m = 0
+        for f in facts:
+            m |= 1 << self.fact_id[f]
+        return m
+
+    def applicable(self, state):
+        yield from self.no_pre
+        for f in bits(state):
+            for a in self.watchers[f]:
+                if not self.pre[a] & ~state:
+                    yield a
+
+    def successor(self, state, a):
+        return (state & ~self.dele[a]) | self.add[a]
+
+    # ----------------------------------------------------------------
+    # Delete-relaxation heuristics
+    # ----------------------------------------------------------------
+    def relaxed_costs(self, state):
+        """
+        Generalised Dijkstra over the delete relaxation: h_add cost of every
+        fact from `state` and the cheapest supporter action of each.
+        Stops as soon as every goal fact has been settled.
+        """
+        INF = float("inf")
+        cost = [INF] * self.n_facts
+        supporter = [None] * self.n_facts
+        remaining = self.n_pre[:]
+        acc = [0] * len(self.pre)
+        heap = []
+
+        for f in bits(state):
+            cost[f] = 0
+            heap.append((0, f))
+
+        def fire(a, base):
+            c = base + self.cost[a]
+            for g in self.add_ids[a]:
+                if c < cost[g]:
+                    cost[g] = c
+                    supporter[g] = a
+                    heapq.heappush(heap, (c, g))
+
+        for a in self.no_pre:
+            fire(a, 0)
+
+        open_goals = sum(1 for g in self.goal_ids if not state >> g & 1)
+        settled = [False] * self.n_facts
+        while heap and open_goals:
+            c, f = heapq.heappop(heap)
+            if settled[f]:
+                continue
+            settled[f] = True
+            if self.goals >> f & 1 and not state >> f & 1:
+                open_goals -= 1
+            for a in self.consumers[f]:
+                acc[a] += c
+                remaining[a] -= 1
+                if remaining[a] == 0:
+                    fire(a, acc[a])
+        return cost, supporter
+
+    def h_add(self, state):
+        cost, _ = self.relaxed_costs(state)
+        return sum(cost[g] for g in self.goal_ids)
+
+    def h_ff(self, state):
+        """Cost of a relaxed plan read off the h_add best supporters."""
+        cost, supporter = self.relaxed_costs(state)
+        if any(cost[g] == float("inf") for g in self.goal_ids):
+            return float("inf")
+        return sum(self.cost[a] for a in self.relaxed_plan(state, supporter))
+
+    def relaxed_plan(self, state, supporter):
+        """Actions of the relaxed plan through the given best supporters."""
+        plan = set()
+        seen = state
+        stack = [g for g in self.goal_ids if not state >> g & 1]
+        for g in stack:
+            seen |= 1 << g
+        while stack:
+            a = supporter[stack.pop()]
+            if a in plan:
+                continue
+            plan.add(a)
+            for p in self.pre_ids[a]:
+                if not seen >> p & 1:
+                    seen |= 1 << p
+                    stack.append(p)
+        return plan
+
+    def evaluate(self, state, heuristic="ff"):
+        """
+        (h, preferred actions, relaxed plan) for a named heuristic, from one
+        relaxed_costs pass. The relaxed plan is ordered cheapest
+        preconditions first; the preferred actions are its actions
+        applicable in `state` (FF's helpful actions).
+        """
+        cost, supporter = self.relaxed_costs(state)
+        if any(cost[g] == float("inf") for g in self.goal_ids):
+            return float("inf"), frozenset(), []
+        plan = self.relaxed_plan(state, supporter)
+        if heuristic == "add":
+            h = sum(cost[g] for g in self.goal_ids)
+        else:
+            h = sum(self.cost[a] for a in plan)
+        preferred = frozenset(a for a in plan if not self.pre[a] & ~state)
+        order = sorted(plan, key=lambda a: (sum(cost[p] for p in self.pre_ids[a]), a))
+        return h, preferred, order
+
+    def lookahead(self, state, relaxed_plan):
+        """
+        Apply relaxed-plan actions, in order and each at most once, for as
+        long as any of them is applicable (YAHSP-style lookahead).
+        Returns (reached state, actions applied).
+        """
+        todo = relaxed_plan
+        path = []
+        while todo:
+            rest = []
+            for a in todo:
+                if self.pre[a] & ~state:
+                    rest.append(a)
+                else:
+                    state = self.successor(state, a)
+                    path.append(a)
+            if len(rest) == len(todo):
+                break
+            todo = rest
+        return state, path
+
+
+HEURISTICS = {
+    "add": StripsTask.h_add,
+    "ff": StripsTask.h_ff,
+}
+
+
+def forward_search(task, heuristic="ff", weight=None, max_expansions=None, lookahead=True):
+    """
+    Best-first search in the forward state space of `task`.
+
+    weight=None is greedy best-first (order by h only); a number w gives
+    weighted A* with f = g + w * h (w=1 is plain A*).
+
+    Evaluation is deferred: a successor is queued under its parent's h and
+    only evaluated once popped, so an expansion costs one heuristic call
+    however many actions apply. Preferred actions (see evaluate) go first
+    among successors with equal keys, and greedy search with lookahead
+    also queues, ahead of them, the state reached by running the relaxed
+    plan (see lookahead), which jumps across plateaus where h rises
+    before it falls.
+
+    Duplicate states are detected through their bitset; under weighted A*
+    a state reached again on a cheaper g is re-opened, greedy search keeps
+    the first path found.
+    Returns a list of action ids, or None if the goals are unreachable.
+    """
+    if isinstance(heuristic, str):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"unknown heuristic {heuristic!r}")
+        evaluate = lambda s: task.evaluate(s, heuristic)
+    else:
+        evaluate = lambda s: (heuristic(task, s), frozenset(), [])
+    lookahead = lookahead and weight is None
+    INF = float("inf")
+    goals = task.goals
+    tie = itertools.count()
+
+    best_g = {}
+    parent = {}
+    h_cache = {}    # re-opened states (weighted A* only) keep their evaluation
+    # (key, rank, tie, parent state, actions, g): the state itself is built
+    # when the entry is popped; rank orders lookahead < preferred < other
+    frontier = [(0, 0, next(tie), None, (), 0)]
+    expansions = 0
+
+    while frontier:
+        _, _, _, p, acts, g = heapq.heappop(frontier)
+        s = task.init if p is None else p
+        for a in acts:
+            s = task.successor(s, a)
+        seen = best_g.get(s)
+        if seen is not None and (weight is None or g >= seen):
+            continue
+        best_g[s] = g
+        parent[s] = (p, acts)
+        if not goals & ~s:
+            plan = []
+            while parent[s][0] is not None:
+                s, acts = parent[s]
+                plan.extend(reversed(acts))
+            return plan[::-1]
+
+        expansions += 1
+        if max_expansions is not None and expansions > max_expansions:
+            return None
+        if weight is None:
+            h, preferred, relaxed = evaluate(s)
+        else:
+            if s not in h_cache:
+                h_cache[s] = evaluate(s)
+            h, preferred, relaxed = h_cache[s]
+        if h == INF:
+            continue
+
+        if lookahead and relaxed:
+            t, path = task.lookahead(s, relaxed)
+            if len(path) > 1 and t not in best_g:
+                g_t = g + sum(task.cost[a] for a in path)
+                heapq.heappush(frontier, (h, 0, next(tie), s, tuple(path), g_t))
+        for b in task.applicable(s):
+            g_b = g + task.cost[b]
+            key = h if weight is None else g_b + weight * h
+            heapq.heappush(frontier, (key, 2 - (b in preferred), next(tie), s, (b,), g_b))
+    return None
+
+
+def forward_plan(init=None, goals=None, actions=None, heuristic="ff", weight=None):
+    """
+    Sequential plan (list of action names) for the get_actions() domain,
+    or None when no plan exists.
+    """
+    task = StripsTask(get_actions() if actions is None else actions,
+                      get_initial_state() if init is None else init,
+                      get_goals() if goals is None else goals)
+    plan = forward_search(task, heuristic, weight)
+    return None if plan is None else [task.action_names[a] for a in plan]
+
+
+
+def run_forward_search_module(init=None, heuristic="ff", weight=None):
+    """
+    Solve the planning problem by heuristic forward search.
+    Returns: list of actions, in the same flat form as run_planning_module
+    """
+    return forward_plan(init=init, heuristic=heuristic, weight=weight) or []
+
+
+
+if __name__ == "__main__":
+    acts = run_forward_search_module()
+    print("\nForward-search Planning Actions:")
+    for a in acts:
+        print("-", a)
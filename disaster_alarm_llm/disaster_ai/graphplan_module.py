@@ -1,5 +1,9 @@
-
-import networkx as nx
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 def get_actions():
@@ -45,98 +49,562 @@ def get_actions():
 
 
 
-def build_planning_graph(levels=3):
-    """
-    Returns a NetworkX planning graph.
-    Structure:
-        S0 → A0 → S1 → A1 → S2 …
-    """
-
-    graph = nx.DiGraph()
-    actions = get_actions()
-
-    
-    S0 = {
+def get_initial_state():
+    return {
         "FloodWarning",
         "Bridge_Collapse_Risk",
         "DiseaseRisk"
     }
 
-   
-    for fact in S0:
-        graph.add_node(f"F0_{fact}", label=fact, type="fact", level=0)
 
-    
-    prev_facts = S0
+def get_goals():
+    return {
+        "PopulationEvacuated",
+        "SheltersOpen",
+        "AlternateRouteActive",
+        "MedicalSuppliesReady",
+        "DroneAssessmentDone"
+    }
 
-    for lvl in range(levels):
 
-        
-        for act_name, act_data in actions.items():
 
-            
-            if act_data["pre"].issubset(prev_facts):
+def bits(x):
+    """Indices of the set bits of an int bitset."""
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
 
-                act_node = f"A{lvl}_{act_name}"
-                graph.add_node(act_node, label=act_name, type="action", level=lvl)
 
-                
-                for pre in act_data["pre"]:
-                    graph.add_edge(f"F{lvl}_{pre}", act_node)
+class PlanningGraph:
+    """
+    GraphPlan planning graph over interned integer ids.
 
-                
-                for addf in act_data["add"]:
-                    next_fact_node = f"F{lvl+1}_{addf}"
-                    graph.add_node(next_fact_node, label=addf, type="fact", level=lvl+1)
-                    graph.add_edge(act_node, next_fact_node)
+    Facts and actions (plus one no-op per fact) are numbered once; every
+    fact layer, action layer and mutex relation is a Python int bitset.
+    Layer i of actions connects fact layer i to fact layer i+1:
 
-        
-        next_facts = set()
-        for n, d in graph.nodes(data=True):
-            if d.get("type") == "fact" and d.get("level") == lvl+1:
-                next_facts.add(d["label"])
-        prev_facts = next_facts
+        facts[i]          bitset of facts at level i
+        fact_mutex[i][f]  bitset of facts mutex with f at level i
+        actions[i]        bitset of actions applicable at level i
+        action_mutex[i]   {action id: bitset of mutex actions}
+    """
+
+    def __init__(self, actions, init):
+        fact_names = set(init)
+        for a in actions.values():
+            fact_names |= a["pre"] | a["add"] | a["del"]
+        self.fact_names = sorted(fact_names)
+        self.fact_id = {f: i for i, f in enumerate(self.fact_names)}
+        n_facts = len(self.fact_names)
+
+        # real actions first, then the no-op of fact f at id n_real + f
+        self.action_names = list(actions) + [None] * n_facts
+        self.n_real = len(actions)
+        self.pre, self.add, self.dele = [], [], []
+        for a in actions.values():
+            self.pre.append(self._mask(a["pre"]))
+            self.add.append(self._mask(a["add"]))
+            self.dele.append(self._mask(a["del"]))
+        for f in range(n_facts):
+            self.pre.append(1 << f)
+            self.add.append(1 << f)
+            self.dele.append(0)
+        n_actions = len(self.pre)
+
+        # fact -> bitset of actions that need / add / delete it
+        self.consumers = [0] * n_facts
+        self.adders = [0] * n_facts
+        deleters = [0] * n_facts
+        for a in range(n_actions):
+            for f in bits(self.pre[a]):
+                self.consumers[f] |= 1 << a
+            for f in bits(self.add[a]):
+                self.adders[f] |= 1 << a
+            for f in bits(self.dele[a]):
+                deleters[f] |= 1 << a
+
+        # inconsistent effects / interference never depend on the level
+        self.static_mutex = []
+        for a in range(n_actions):
+            m = 0
+            for f in bits(self.pre[a] | self.add[a]):
+                m |= deleters[f]
+            for f in bits(self.dele[a]):
+                m |= self.consumers[f] | self.adders[f]
+            self.static_mutex.append(m & ~(1 << a))
+        for a in range(n_actions):
+            for b in bits(self.static_mutex[a]):
+                self.static_mutex[b] |= 1 << a
+
+        self.init = self._mask(init)
+        self.facts = [self.init]
+        self.fact_mutex = [[0] * n_facts]
+        self.actions = []
+        self.action_mutex = []
+        self.nogoods = [set()]
+        self.leveled_off = False
+        # level from which layers were shared with the graph this was rebased from
+        self.reused_from = None
+
+    def _mask(self, facts):
+        m = 0
+        for f in facts:
+            m |= 1 << self.fact_id[f]
+        return m
+
+    @property
+    def levels(self):
+        return len(self.facts) - 1
+
+    def is_noop(self, a):
+        return a >= self.n_real
+
+    def expand(self, base=None):
+        """
+        Add one action layer and the fact layer after it. With `base` (a
+        graph over the same actions) the layer is patched from base's layer
+        at the same level instead of computed from scratch.
+        """
+        F = self.facts[-1]
+        fm = self.fact_mutex[-1]
+        if base is None:
+            applicable, amutex, next_F, next_fm = self._next_layer(F, fm)
+        else:
+            applicable, amutex, next_F, next_fm = base._patch_layer(F, fm, self.levels)
+
+        self.leveled_off = next_F == F and next_fm == fm
+        self.actions.append(applicable)
+        self.action_mutex.append(amutex)
+        self.facts.append(next_F)
+        self.fact_mutex.append(next_fm)
+        self.nogoods.append(set())
+
+    def _next_layer(self, F, fm):
+        applicable = 0
+        pre_mutex = {}
+        for a in range(len(self.pre)):
+            pre = self.pre[a]
+            if pre & ~F:
+                continue
+            m = 0
+            for f in bits(pre):
+                m |= fm[f]
+            if m & pre:
+                continue
+            applicable |= 1 << a
+            pre_mutex[a] = m
+
+        amutex = {}
+        for a, m in pre_mutex.items():
+            # competing needs: b requires a fact that is mutex with a's preconditions
+            competing = 0
+            for f in bits(m):
+                competing |= self.consumers[f]
+            amutex[a] = (self.static_mutex[a] | competing) & applicable
+
+        next_F = 0
+        for a in pre_mutex:
+            next_F |= self.add[a]
+
+        achievers = {f: self.adders[f] & applicable for f in bits(next_F)}
+        next_fm = [0] * len(self.fact_names)
+        for p, ach_p in achievers.items():
+            # actions that are mutex with every achiever of p
+            common = -1
+            for x in bits(ach_p):
+                common &= amutex[x]
+            for q, ach_q in achievers.items():
+                if q != p and not (ach_q & ~common):
+                    next_fm[p] |= 1 << q
+
+        return applicable, amutex, next_F, next_fm
+
+    def _patch_layer(self, F, fm, lvl):
+        """
+        _next_layer(F, fm), derived from this graph's layer at `lvl`. Only
+        actions consuming a fact whose presence or mutex row differs are
+        re-checked, and only fact pairs involving an effect of an action
+        whose applicability or mutexes changed are re-derived; both mutex
+        relations are symmetric, so the rest is copied.
+        """
+        old_F, old_fm = self.facts[lvl], self.fact_mutex[lvl]
+        old_amutex = self.action_mutex[lvl]
+        changed = F ^ old_F
+        for f in bits(F | old_F):
+            if fm[f] != old_fm[f]:
+                changed |= 1 << f
+        touched = 0
+        for f in bits(changed):
+            touched |= self.consumers[f]
+
+        applicable = self.actions[lvl] & ~touched
+        pre_mutex = {}
+        for a in bits(touched):
+            pre = self.pre[a]
+            if pre & ~F:
+                continue
+            m = 0
+            for f in bits(pre):
+                m |= fm[f]
+            if m & pre:
+                continue
+            applicable |= 1 << a
+            pre_mutex[a] = m
+
+        amutex = {a: old_amutex[a] & ~touched for a in bits(applicable & ~touched)}
+        for a, m in pre_mutex.items():
+            competing = 0
+            for f in bits(m):
+                competing |= self.consumers[f]
+            amutex[a] = (self.static_mutex[a] | competing) & applicable
+            for b in bits(amutex[a] & ~touched):
+                amutex[b] |= 1 << a
+
+        next_F = 0
+        for a in bits(applicable):
+            next_F |= self.add[a]
+
+        # facts whose achievers or achiever mutexes may differ
+        old_next_F = self.facts[lvl + 1]
+        affected = next_F ^ old_next_F
+        for a in bits(touched | self.actions[lvl]):
+            if amutex.get(a) != old_amutex.get(a):
+                affected |= self.add[a]
+
+        achievers = {f: self.adders[f] & applicable for f in bits(next_F)}
+        next_fm = [m & ~affected for m in self.fact_mutex[lvl + 1]]
+        for p in bits(affected):
+            next_fm[p] = 0
+            if p not in achievers:
+                continue
+            common = -1
+            for x in bits(achievers[p]):
+                common &= amutex[x]
+            for q, ach_q in achievers.items():
+                if q != p and not (ach_q & ~common):
+                    next_fm[p] |= 1 << q
+            for q in bits(next_fm[p] & ~affected):
+                next_fm[q] |= 1 << p
+
+        return applicable, amutex, next_F, next_fm
+
+    def knows(self, facts):
+        return all(f in self.fact_id for f in facts)
+
+    def rebase(self, init):
+        """
+        Planning graph for a different initial state over the same action
+        set. Layers are rebuilt bottom-up, each one patched from this
+        graph's layer at the same level, up to the first level (the top one
+        included) whose facts and mutexes coincide with this graph's; every
+        layer from there on is shared as is and reused_from records that
+        level. Nogoods are not carried over, extraction reaches down to the
+        new initial state.
+        """
+        pg = copy.copy(self)
+        pg.init = self._mask(init)
+        pg.facts = [pg.init]
+        pg.fact_mutex = [self.fact_mutex[0]]
+        pg.actions = []
+        pg.action_mutex = []
+        pg.nogoods = [set()]
+        pg.leveled_off = False
+        pg.reused_from = None
+
+        for lvl in range(self.levels + 1):
+            if pg.facts[lvl] == self.facts[lvl] and pg.fact_mutex[lvl] == self.fact_mutex[lvl]:
+                if lvl < self.levels:
+                    pg.actions += self.actions[lvl:]
+                    pg.action_mutex += self.action_mutex[lvl:]
+                    pg.facts += self.facts[lvl + 1:]
+                    pg.fact_mutex += self.fact_mutex[lvl + 1:]
+                    pg.nogoods += [set() for _ in range(self.levels - lvl)]
+                    pg.leveled_off = self.leveled_off
+                pg.reused_from = lvl
+                break
+            if lvl < self.levels:
+                pg.expand(base=self)
+        return pg
+
+    def goals_reachable(self, goals, level):
+        if goals & ~self.facts[level]:
+            return False
+        fm = self.fact_mutex[level]
+        return not any(fm[g] & goals for g in bits(goals))
+
+    def extract(self, goals, level):
+        """
+        Backward search from `goals` (bitset) at fact level `level`.
+        Returns a list of per-step action-id lists, or None. Failed goal
+        sets are memoized as nogoods per level.
+        """
+        if level == 0:
+            return [] if not goals & ~self.init else None
+        if goals in self.nogoods[level]:
+            return None
+        plan = self._assign(list(bits(goals)), 0, level, 0, 0, 0, [])
+        if plan is None:
+            self.nogoods[level].add(goals)
+        return plan
+
+    def _assign(self, goals, i, level, added, mutex, pre, chosen):
+        while i < len(goals) and added >> goals[i] & 1:
+            i += 1
+        if i == len(goals):
+            sub = self.extract(pre, level - 1)
+            return None if sub is None else sub + [chosen]
+
+        g = goals[i]
+        layer = self.actions[level - 1]
+        amutex = self.action_mutex[level - 1]
+        candidates = self.adders[g] & layer & ~mutex
+        noop = self.n_real + g
+        # try the no-op first, it adds no new preconditions
+        order = ([noop] if candidates >> noop & 1 else []) + \
+            [a for a in bits(candidates) if a != noop]
+        for a in order:
+            plan = self._assign(goals, i + 1, level,
+                                added | self.add[a], mutex | amutex[a],
+                                pre | self.pre[a], chosen + [a])
+            if plan is not None:
+                return plan
+        return None
+
+    def solve(self, goals, max_levels=50):
+        """
+        Expand until the goals are reachable and a plan can be extracted.
+        Stops early once the graph has leveled off at some level n and a
+        stage adds no nogoods at level n (Blum & Furst), or at once when a
+        goal fact never occurs. Returns [[action names per step], ...] or None.
+        """
+        if not self.knows(goals):
+            return None
+        goals = self._mask(goals)
+        last_nogoods = None
+        while True:
+            level = self.levels
+            if self.goals_reachable(goals, level):
+                plan = self.extract(goals, level)
+                if plan is not None:
+                    return [[self.action_names[a] for a in step if not self.is_noop(a)]
+                            for step in plan]
+                if self.leveled_off:
+                    # Blum & Furst: once the graph has leveled off at level n,
+                    # a stage that adds no nogood at level n proves there is no plan
+                    n = self.level_off_level()
+                    if len(self.nogoods[n]) == last_nogoods:
+                        return None
+                    last_nogoods = len(self.nogoods[n])
+            elif self.leveled_off:
+                return None
+            if level >= max_levels:
+                return None
+            self.expand()
+
+    def level_off_level(self):
+        """First level n whose facts and mutexes equal those of level n+1, or None."""
+        for n in range(self.levels):
+            if self.facts[n] == self.facts[n + 1] and self.fact_mutex[n] == self.fact_mutex[n + 1]:
+                return n
+        return None
+
+
+class IncrementalPlanner:
+    """
+    Keeps expanded planning graphs between calls, keyed by initial state
+    (LRU, max_cached entries). A new initial state is derived from the most
+    recently used graph with PlanningGraph.rebase, and solve() resumes
+    expansion from the last cached level instead of starting at S0.
+    update() edits the current initial state, which starts as `init`
+    (get_initial_state() by default).
+    """
+
+    def __init__(self, actions=None, max_cached=32, init=None):
+        self.actions = get_actions() if actions is None else actions
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self.current = None
+        self.current_init = frozenset(get_initial_state() if init is None else init)
+
+    def graph_for(self, init):
+        key = frozenset(init)
+        pg = self._cache.get(key)
+        if pg is not None:
+            self._cache.move_to_end(key)
+        elif self.current is not None and self.current.knows(key):
+            pg = self.current.rebase(key)
+        else:
+            pg = PlanningGraph(self.actions, key)
+
+        self._cache[key] = pg
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        self.current = pg
+        self.current_init = key
+        return pg
+
+    def update(self, added=(), removed=()):
+        """Graph for the current initial state with some facts added/removed."""
+        return self.graph_for((self.current_init | set(added)) - set(removed))
+
+    def plan(self, goals=None, init=None, max_levels=50):
+        pg = self.graph_for(get_initial_state() if init is None else init)
+        return pg.solve(get_goals() if goals is None else goals, max_levels)
 
-    return graph
 
+_planner = IncrementalPlanner()
 
 
-def extract_action_list(graph):
+def graphplan(init=None, goals=None, actions=None, max_levels=50):
+    pg = PlanningGraph(get_actions() if actions is None else actions,
+                       get_initial_state() if init is None else init)
+    return pg.solve(get_goals() if goals is None else goals, max_levels)
+
+
+
+def build_planning_graph(levels=3, pg=None):
     """
-    Returns a list of action labels from the planning graph.
-    Only first 5 needed for LLM Module.
+    Returns a NetworkX view of the planning graph (no-ops omitted).
+    Structure:
+        S0 → A0 → S1 → A1 → S2 …
     """
-    actions = []
-    for n, d in graph.nodes(data=True):
-        if d.get("type") == "action":
-            actions.append(d["label"])
+    import networkx as nx
+
+    if pg is None:
+        pg = PlanningGraph(get_actions(), get_initial_state())
+    while pg.levels < levels:
+        pg.expand()
+
+    graph = nx.DiGraph()
+    for lvl in range(levels + 1):
+        for f in bits(pg.facts[lvl]):
+            fact = pg.fact_names[f]
+            graph.add_node(f"F{lvl}_{fact}", label=fact, type="fact", level=lvl)
+
+    for lvl in range(levels):
+        for a in bits(pg.actions[lvl]):
+            if pg.is_noop(a):
+                continue
+            act_name = pg.action_names[a]
+            act_node = f"A{lvl}_{act_name}"
+            graph.add_node(act_node, label=act_name, type="action", level=lvl)
+            for f in bits(pg.pre[a]):
+                graph.add_edge(f"F{lvl}_{pg.fact_names[f]}", act_node)
+            for f in bits(pg.add[a]):
+                graph.add_edge(act_node, f"F{lvl+1}_{pg.fact_names[f]}")
+
+    return graph
+
 
-    return actions[:5]
+
+def extract_action_list(plan):
+    """
+    Flattens a graphplan() result into a list of action labels, in
+    execution order, for the LLM Module.
+    """
+    if not plan:
+        return []
+    return [a for step in plan for a in step]
 
 
 
 
 def save_graph_as_dot(graph, path="data/graphplan_output.dot"):
+    import networkx as nx
+
     nx.drawing.nx_pydot.write_dot(graph, path)
     return path
 
 
+def graph_digest(pg, levels):
+    """Content hash of the first `levels` layers of a planning graph."""
+    key = (pg.fact_names, pg.action_names[:pg.n_real],
+           pg.facts[:levels + 1], pg.actions[:levels])
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+class DotArtifactWriter:
+    """
+    Off-the-hot-path DOT export. Graphs are snapshotted on the caller's
+    thread and rendered/written by a single background worker; networkx
+    and pydot are only imported there. A graph whose digest matches the
+    last one written to the same path (tracked in <path>.sha1) is skipped.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def submit(self, pg, levels, path="data/graphplan_output.dot"):
+        while pg.levels < levels:
+            pg.expand()
+        digest = graph_digest(pg, levels)
+
+        # freeze the layers the worker reads; pg keeps growing on this thread
+        snapshot = copy.copy(pg)
+        snapshot.facts = pg.facts[:levels + 1]
+        snapshot.actions = pg.actions[:levels]
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1,
+                                                    thread_name_prefix="graphplan-dot")
+            future = self._executor.submit(self._write, snapshot, levels, path, digest)
+            self._pending = [f for f in self._pending if not f.done()] + [future]
+        return future
+
+    def _write(self, pg, levels, path, digest):
+        stamp = path + ".sha1"
+        if os.path.exists(path) and os.path.exists(stamp):
+            with open(stamp) as f:
+                if f.read().strip() == digest:
+                    return None
+        save_graph_as_dot(build_planning_graph(levels, pg), path)
+        with open(stamp, "w") as f:
+            f.write(digest)
+        return path
+
+    def flush(self):
+        """Block until every submitted export has been written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for f in pending:
+            f.result()
+
+
+_dot_writer = DotArtifactWriter()
+
+
+def flush_artifacts():
+    _dot_writer.flush()
+
+
 
 
-def run_planning_module(levels=3):
+def run_planning_module(levels=3, init=None, render=False,
+                        dot_path="data/graphplan_output.dot"):
     """
-    Build planning graph, extract actions, save DOT.
+    Solve the planning problem with GraphPlan.
+    Graphs are cached across calls, so a changed initial state only
+    recomputes the layers it affects. With render=True the DOT file is
+    queued for a background writer; planning latency never includes it
+    (call flush_artifacts() to wait for the file).
     Returns: list of actions
     """
-    G = build_planning_graph(levels)
-    actions = extract_action_list(G)
-    save_graph_as_dot(G)
+    pg = _planner.graph_for(get_initial_state() if init is None else init)
+    plan = pg.solve(get_goals())
+    actions = extract_action_list(plan)
+    if render:
+        _dot_writer.submit(pg, levels, dot_path)
     return actions
 
 
 
 if __name__ == "__main__":
-    acts = run_planning_module()
+    acts = run_planning_module(render=True)
     print("\nRecommended Planning Actions:")
     for a in acts:
         print("-", a)
+    flush_artifacts()
@@ -2,6 +2,9 @@
 
 
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import ollama
 
 
@@ -182,10 +185,17 @@ Key Constraints & Dependencies:
 
 
 
-def llm_generate(model, prompt):
+def _chunk_text(chunk):
+    try:
+        return chunk["message"]["content"] or ""
+    except (KeyError, TypeError):
+        return ""
+
+
+def llm_stream(model, prompt):
     """
-    Reliable wrapper for long output.
-    Ensures NO truncation.
+    Yields the response text piece by piece as the model produces it,
+    so callers can forward it before generation has finished.
     """
     stream = ollama.chat(
         model=model,
@@ -193,15 +203,89 @@ def llm_generate(model, prompt):
         stream=True,
         options={"num_predict": 512}
     )
-    
-    out = ""
     for chunk in stream:
-        if "message" in chunk and "content" in chunk["message"]:
-            out += chunk["message"]["content"]
-    return out
+        piece = _chunk_text(chunk)
+        if piece:
+            yield piece
+
+
+def llm_generate(model, prompt, on_token=None):
+    """
+    Reliable wrapper for long output.
+    Ensures NO truncation. on_token(piece) is called for every streamed piece.
+    """
+    parts = []
+    for piece in llm_stream(model, prompt):
+        if on_token is not None:
+            on_token(piece)
+        parts.append(piece)
+    return "".join(parts)
+
+
+async def llm_astream(model, prompt, client=None):
+    """Async-iterator version of llm_stream, on an ollama.AsyncClient."""
+    client = client or ollama.AsyncClient()
+    stream = await client.chat(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True,
+        options={"num_predict": 512}
+    )
+    async for chunk in stream:
+        piece = _chunk_text(chunk)
+        if piece:
+            yield piece
+
 
+async def stream_multilingual(model, prompts, client=None):
+    """
+    Runs every {language: prompt} generation concurrently and yields
+    (language, piece) in arrival order, so each broadcast channel can
+    start on its language as soon as the first tokens exist.
+    """
+    client = client or ollama.AsyncClient()
+    queue = asyncio.Queue()
+    done = object()
+
+    async def pump(lang, prompt):
+        try:
+            async for piece in llm_astream(model, prompt, client):
+                await queue.put((lang, piece))
+        finally:
+            await queue.put((lang, done))
+
+    tasks = [asyncio.create_task(pump(lang, p)) for lang, p in prompts.items()]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            lang, piece = await queue.get()
+            if piece is done:
+                remaining -= 1
+            else:
+                yield lang, piece
+        # surface any generation error
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def agenerate_multilingual(model, prompts, on_token=None, client=None):
+    """
+    Concurrent generation of every {language: prompt}; latency is that of
+    the slowest language instead of the sum. on_token(language, piece) is
+    called as pieces arrive. Returns {language: full text}.
+    """
+    parts = {lang: [] for lang in prompts}
+    async for lang, piece in stream_multilingual(model, prompts, client):
+        if on_token is not None:
+            on_token(lang, piece)
+        parts[lang].append(piece)
+    return {lang: "".join(p) for lang, p in parts.items()}
 
-def generate_disaster_advisory_integrated(model_name="llama3"):
+
+def build_advisory_prompts():
+    """Returns (pop_planning summary, {"en": prompt, "or": prompt})."""
 
     # --------- EXTRACT POP PLANNING FACTS ---------
     pop_planning = extract_pop_planning_summary()
@@ -263,9 +347,6 @@ Requirements:
 
 """
     
-
-    english_text = llm_generate(model_name, english_prompt)
-    
     
     odia_prompt = f"""
 ସାଧାରଣ ସୁରକ୍ଷା ସୂଚନା — ଓଡ଼ିଶାରେ ଅନେକ ବିପଦର ପୂର୍ବ ସତର୍କବାଣୀ
@@ -288,10 +369,16 @@ Requirements:
 
 """
     
+    return pop_planning, {"en": english_prompt, "or": odia_prompt}
 
-    odia_text = llm_generate(model_name, odia_prompt)
-    
- 
+
+def format_advisory(pop_planning, texts):
+    """
+    Section 2 keeps the reviewed Odia wording; the model's own Odia text
+    follows it as section 3, so the concurrent generation is not lost.
+    """
+    english_text = texts["en"]
+    odia_text = texts.get("or", "").strip()
     
     final_output = f"""
 
@@ -325,11 +412,48 @@ SECTION 2 → ODIA ADVISORY
 ଶିବିରଗୁଡିକୁ ସଫା ରଖିବାକୁ ସେବକମାନଙ୍କୁ ଅନୁରୋଧ।
 
 ସ୍ଥିର ରହନ୍ତୁ, ସତର୍କ ରହନ୍ତୁ, ଓ ସରକାରୀ ସୂଚନାକୁ ଅନୁସରଣ କରନ୍ତୁ। ପୂର୍ବ ପ୍ରସ୍ତୁତି ଆପଣଙ୍କ ସୁରକ୍ଷାକୁ ବଢ଼ାଇ ପାରିବ।
+"""
+    if odia_text:
+        final_output += f"""
+========================================================
+SECTION 3 → ODIA ADVISORY (MODEL GENERATED)
+========================================================
+
+{odia_text}
 """
     
     return final_output
 
 
+async def agenerate_disaster_advisory_integrated(model_name="llama3", on_token=None):
+    """
+    English and Odia advisories generated concurrently.
+    on_token(language, piece) receives tokens as they stream ("en" / "or").
+    """
+    pop_planning, prompts = build_advisory_prompts()
+    texts = await agenerate_multilingual(model_name, prompts, on_token)
+    return format_advisory(pop_planning, texts)
+
+
+def generate_disaster_advisory_integrated(model_name="llama3", on_token=None):
+    """
+    Blocking wrapper around agenerate_disaster_advisory_integrated. Inside
+    an already running event loop (e.g. Jupyter), asyncio.run is not
+    allowed, so the generation runs on its own loop in a helper thread and
+    on_token is called from that thread; async callers should await
+    agenerate_disaster_advisory_integrated instead.
+    """
+    def run():
+        return asyncio.run(agenerate_disaster_advisory_integrated(model_name, on_token))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run).result()
+
+
 
 if __name__ == "__main__":
     
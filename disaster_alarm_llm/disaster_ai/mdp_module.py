@@ -0,0 +1,156 @@
+
+import numpy as np
+
+from disaster_ai.qlearning_module import STATES, ACTIONS, next_state, reward, compile_environment
+
+
+class TabularMDP:
+    """
+    Finite MDP in sparse successor form.
+
+        next_idx[s, a, k]  index of the k-th possible successor
+        probs[s, a, k]     its probability (rows sum to 1)
+        rewards[s, a]      expected immediate reward
+
+    K (successors per state-action) stays small even when S is 10^5-10^6,
+    so memory is O(S*A*K) instead of the O(S*S*A) of a dense tensor.
+    """
+
+    def __init__(self, next_idx, probs, rewards, states=None, actions=None):
+        self.next_idx = np.asarray(next_idx, dtype=np.int64)
+        self.probs = np.asarray(probs, dtype=np.float64)
+        self.rewards = np.asarray(rewards, dtype=np.float64)
+        self.states = states
+        self.actions = actions
+
+    @property
+    def n_states(self):
+        return self.rewards.shape[0]
+
+    @property
+    def n_actions(self):
+        return self.rewards.shape[1]
+
+    @classmethod
+    def from_kernel(cls, n_states, n_actions, kernel, reward_fn, chunk=1 << 16,
+                    states=None, actions=None):
+        """
+        Build from vectorized callables, for factored state spaces:
+            kernel(s_idx, a)    -> (next_idx (n, K), probs (n, K))
+            reward_fn(s_idx, a) -> rewards (n,)
+        States are compiled in chunks so temporaries stay bounded.
+        """
+        next_idx = probs = None
+        rewards = np.empty((n_states, n_actions))
+        for lo in range(0, n_states, chunk):
+            s = np.arange(lo, min(lo + chunk, n_states))
+            for a in range(n_actions):
+                nxt, p = kernel(s, a)
+                if next_idx is None:
+                    k = nxt.shape[1]
+                    next_idx = np.empty((n_states, n_actions, k), dtype=np.int64)
+                    probs = np.empty((n_states, n_actions, k))
+                next_idx[s, a] = nxt
+                probs[s, a] = p
+                rewards[s, a] = reward_fn(s, a)
+        return cls(next_idx, probs, rewards, states=states, actions=actions)
+
+    def q_values(self, V, gamma):
+        return self.rewards + gamma * (self.probs * V[self.next_idx]).sum(axis=-1)
+
+    def policy_matrix(self, policy):
+        """Dense P_pi (S x S); only sensible for small S."""
+        S = self.n_states
+        s = np.arange(S)
+        P = np.zeros((S, S))
+        np.add.at(P, (np.repeat(s, self.next_idx.shape[2]),
+                      self.next_idx[s, policy].ravel()),
+                  self.probs[s, policy].ravel())
+        return P
+
+
+def compile_mdp(states=STATES, actions=ACTIONS, next_state_fn=next_state, reward_fn=reward):
+    """
+    Compile the string-keyed qlearning environment into a TabularMDP,
+    through qlearning_module.compile_environment. next_state is
+    deterministic, so every (s, a) has a single successor.
+    """
+    T, R = compile_environment(states, actions, next_state_fn, reward_fn)
+    return TabularMDP(T[:, :, None], np.ones(T.shape + (1,)), R,
+                      states=list(states), actions=list(actions))
+
+
+def value_iteration(mdp, gamma=0.9, tol=1e-8, max_iter=10000):
+    """
+    Returns (V, policy, iterations). Every sweep is a single vectorized
+    Bellman backup over all states and actions.
+    """
+    V = np.zeros(mdp.n_states)
+    for it in range(1, max_iter + 1):
+        Q = mdp.q_values(V, gamma)
+        V_new = Q.max(axis=1)
+        delta = np.abs(V_new - V).max()
+        V = V_new
+        if delta < tol:
+            break
+    return V, mdp.q_values(V, gamma).argmax(axis=1), it
+
+
+def evaluate_policy(mdp, policy, gamma=0.9, tol=1e-8, max_iter=10000, exact_limit=2000):
+    """
+    V^pi for a deterministic policy (array of action indices). Small MDPs
+    are solved exactly with a linear solve, large ones by iterative sweeps.
+    """
+    s = np.arange(mdp.n_states)
+    r = mdp.rewards[s, policy]
+    if mdp.n_states <= exact_limit:
+        P = mdp.policy_matrix(policy)
+        return np.linalg.solve(np.eye(mdp.n_states) - gamma * P, r)
+
+    nxt = mdp.next_idx[s, policy]
+    p = mdp.probs[s, policy]
+    V = np.zeros(mdp.n_states)
+    for _ in range(max_iter):
+        V_new = r + gamma * (p * V[nxt]).sum(axis=1)
+        if np.abs(V_new - V).max() < tol:
+            return V_new
+        V = V_new
+    return V
+
+
+def policy_iteration(mdp, gamma=0.9, max_iter=1000, **eval_kwargs):
+    """Returns (V, policy, iterations)."""
+    policy = mdp.rewards.argmax(axis=1)
+    for it in range(1, max_iter + 1):
+        V = evaluate_policy(mdp, policy, gamma, **eval_kwargs)
+        Q = mdp.q_values(V, gamma)
+        # keep the current action on ties so the loop terminates
+        current = Q[np.arange(mdp.n_states), policy]
+        improved = np.where(Q.max(axis=1) > current + 1e-12, Q.argmax(axis=1), policy)
+        if np.array_equal(improved, policy):
+            break
+        policy = improved
+    return V, policy, it
+
+
+def policy_as_dict(mdp, policy):
+    return {mdp.states[i]: mdp.actions[a] for i, a in enumerate(policy)}
+
+
+def run_mdp_module(gamma=0.9, method="value_iteration"):
+    """
+    Solve the qlearning environment exactly.
+    Returns: {state: optimal action}
+    """
+    mdp = compile_mdp()
+    solver = policy_iteration if method == "policy_iteration" else value_iteration
+    V, policy, _ = solver(mdp, gamma)
+    return policy_as_dict(mdp, policy)
+
+
+
+if __name__ == "__main__":
+    policy = run_mdp_module()
+    print("\nOptimal MDP Policy:")
+    for s, a in policy.items():
+        print(f"  {s:18s} -> {a}")
@@ -0,0 +1,730 @@
+
+import heapq
+import itertools
+import time
+from collections import deque
+
+
+P_flood=0.55
+P_infra=0.8
+
+init_state = {
+    "action": ("start"),
+    "effects": {
+        ("forecast_heavy_rain", lambda P_flood: P_flood >= 0.5),
+        ("flood_not_occurred", lambda P_flood: P_flood < 0.5),
+        ("flood_risk_high", lambda P_flood: P_flood >= 0.5),
+        ("roads_open", lambda P_flood: P_flood >= 0.5),
+        ("bridges_weak", lambda P_infra: P_infra >= 0.5),
+        ("boats_available", True),
+        ("rescue_team_ready", True),
+        ("medical_supplies_available", True),
+        ("dry_areas_available", True),
+        ("technicians_available", True),
+        ("communication_main_up", True),
+        ("backup_comm_available", True),
+        ("food_supplies_stocked", True),
+        ("community_alerted", False),
+        ("evacuation_started", False),
+        ("medical_kits_stocked", False),
+        ("rescue_team_predeployed", False),
+        ("routes_shifted", False)
+    }
+}
+goal_state1 = {
+    "action": ("rescue_team_work_done"),
+    "effects": {
+        ("people_safe", True),
+        ("rescue_team_predeployed", True),
+        ("rapid_response_prepared", True)
+    }
+}
+goal_state2 = {
+    "action": ("communication_team_work_done"),
+    "effects": {
+        ("communication_backup_operational", True),
+        ("routes_shifted", True)
+    }
+}
+goal_state3 = {
+    "action": ("medical_and_supplies_work_done"),
+    "effects": {
+        ("medical_kits_stocked", True),
+        ("supplies_ready", True)
+    }
+}
+goal_states = {
+    "goal_state1": goal_state1,
+    "goal_state2": goal_state2,
+    "goal_state3": goal_state3
+}
+
+monitor_forecast = {
+    "action": ("monitor_forecast"),
+    "preconditions": {
+        ("forecast_heavy_rain", True)
+    },
+    "effects": {
+        ("flood_risk_high", True),
+        ("forecast_confirmed", True)
+    }
+}
+predeploy_rescue_team = {
+    "action": ("predeploy_rescue_team"),
+    "preconditions": {
+        ("rescue_team_ready", True),
+        ("boats_available", True),
+        ("forecast_confirmed", True)
+    },
+    "effects": {
+        ("rescue_team_predeployed", True),
+        ("rapid_response_prepared", True)
+    }
+}
+stock_medical_kits_in_advance = {
+    "action": ("stock_medical_kits_in_advance"),
+    "preconditions": {
+        ("medical_supplies_available", True),
+        ("technicians_available", True)
+    },
+    "effects": {
+        ("medical_kits_stocked", True)
+    }
+}
+shift_route_due_to_bridge_risk = {
+    "action": ("shift_route_due_to_bridge_risk"),
+    "preconditions": {
+        ("bridges_weak", True),
+        ("roads_open", True)
+    },
+    "effects": {
+        ("routes_shifted", True),
+        ("bridge_area_closed", True)
+    }
+}
+evacuate_before_flood = {
+    "action": ("evacuate_before_flood"),
+    "preconditions": {
+        ("forecast_confirmed", True),
+        ("community_alerted", True),
+        ("dry_areas_available", True)
+    },
+    "effects": {
+        ("evacuation_started", True),
+        ("evacuation_completed", True),
+        ("people_safe", True),
+        ("dry_areas_available", False)##for precendence link
+    }
+}
+alert_community = {
+    "action": ("alert_community"),
+    "preconditions": {
+        ("forecast_confirmed", True),
+        ("community_alerted", False)
+    },
+    "effects": {
+        ("community_alerted", True)
+    }
+}
+establish_backup_communication = {
+    "action": ("establish_backup_communication"),
+    "preconditions": {
+        ("backup_comm_available", True),
+        ("technicians_available", True)
+    },
+    "effects": {
+        ("communication_backup_operational", True),
+        ("technicians_available", False)#for precedence link
+
+    }
+}
+stockpile_food_and_medicine = {
+    "action": ("stockpile_food_and_medicine"),
+    "preconditions": {
+        ("food_supplies_stocked", True),
+        ("dry_areas_available", True)
+    },
+    "effects": {
+        ("supplies_ready", True)
+    }
+}
+prepare_evacuation_centers = {
+    "action": ("prepare_evacuation_centers"),
+    "preconditions": {
+        ("dry_areas_available", True)
+    },
+    "effects": {
+        ("evacuation_centers_ready", True)
+    }
+}
+# -------------------------------
+# Group all actions for easy access
+# -------------------------------
+actions = {
+    "monitor_forecast": monitor_forecast,
+    "predeploy_rescue_team": predeploy_rescue_team,
+    "stock_medical_kits_in_advance": stock_medical_kits_in_advance,
+    "shift_route_due_to_bridge_risk": shift_route_due_to_bridge_risk,
+    "evacuate_before_flood": evacuate_before_flood,
+    "alert_community": alert_community,
+    "establish_backup_communication": establish_backup_communication,
+    "stockpile_food_and_medicine": stockpile_food_and_medicine,
+    "prepare_evacuation_centers": prepare_evacuation_centers,
+    "start":init_state,
+    "rescue_team_work_done":goal_state1,
+    "communication_team_work_done":goal_state2,
+    "medical_and_supplies_work_done":goal_state3
+}
+
+initial_name = "start"
+goal_names = ["rescue_team_work_done", "communication_team_work_done", "medical_and_supplies_work_done"]
+
+
+
+def _call_effect(fn, P_flood, P_infra):
+    """Call an effect lambda with the parameters it names (P_flood and/or P_infra)."""
+    params = {"P_flood": P_flood, "P_infra": P_infra}
+    names = fn.__code__.co_varnames[:fn.__code__.co_argcount]
+    if all(n in params for n in names):
+        return fn(*(params[n] for n in names))
+    # any other parameter names: pass P_flood, P_infra positionally
+    return fn(*(P_flood, P_infra)[:len(names)])
+
+
+def eval_effect_value(val, P_flood, P_infra):
+    if callable(val):
+        try:
+            return bool(_call_effect(val, P_flood, P_infra))
+        except Exception:
+            return None
+    else:
+        return val
+
+
+class DomainIndex:
+    """
+    Operator effects resolved once for a given P_flood / P_infra.
+
+        effects[name]     set of (fact, bool) the operator makes true
+        providers[fact]   operator names achieving fact, in operator order
+        negators[fact]    operator names setting fact to the other value
+        init_facts        facts established by the initial state
+        action_id[name]   bit of the operator in PlanNode.actions
+
+    Effects whose lambda cannot be evaluated are dropped, as
+    eval_effect_value returning None never matched anything.
+    The goal pseudo-operators in goal_names achieve nothing in the
+    domain, so n_providers and fact_costs leave them out.
+    """
+
+    def __init__(self, operators, init_name, init_state, P_flood, P_infra, goal_names=()):
+        self.init_name = init_name
+        self.goal_names = frozenset(goal_names)
+        self.P_flood = P_flood
+        self.P_infra = P_infra
+        self.effects = {}
+        self.providers = {}
+        self.negators = {}
+        self.names = list(operators) if init_name in operators else [init_name] + list(operators)
+        self.action_id = {name: i for i, name in enumerate(self.names)}
+        self._fact_costs = None
+
+        self.init_facts = self._resolve(init_state.get("effects", set()))
+        for name, op in operators.items():
+            facts = self.init_facts if name == init_name else \
+                self._resolve(op.get("effects", set()))
+            self.effects[name] = facts
+            for fact in facts:
+                if name != init_name:
+                    self.providers.setdefault(fact, []).append(name)
+                negs = self.negators.setdefault((fact[0], not fact[1]), [])
+                if name not in negs:
+                    negs.append(name)
+        self._achievers = {
+            fact: (fact in self.init_facts) + sum(a not in self.goal_names for a in provs)
+            for fact, provs in self.providers.items()}
+
+    def _resolve(self, effects):
+        facts = set()
+        for name, val in effects:
+            v = eval_effect_value(val, self.P_flood, self.P_infra)
+            if v is not None:
+                facts.add((name, v))
+        return facts
+
+    def n_providers(self, fact):
+        achievers = self._achievers.get(fact)
+        return achievers if achievers is not None else int(fact in self.init_facts)
+
+    def fact_costs(self, operators):
+        """
+        h_add cost of every fact from the initial state, ignoring negative
+        effects (unit cost per operator). Computed once and cached.
+        """
+        if self._fact_costs is None:
+            cost = {f: 0 for f in self.init_facts}
+            changed = True
+            while changed:
+                changed = False
+                for name, facts in self.effects.items():
+                    if name == self.init_name or name in self.goal_names:
+                        continue
+                    pre = operators[name].get("preconditions", set())
+                    c = 1
+                    for p in pre:
+                        if p not in cost:
+                            break
+                        c += cost[p]
+                    else:
+                        for f in facts:
+                            if c < cost.get(f, float("inf")):
+                                cost[f] = c
+                                changed = True
+            self._fact_costs = cost
+        return self._fact_costs
+
+    def provides(self, name, fact):
+        facts = self.init_facts if name == self.init_name else self.effects.get(name)
+        return facts is not None and fact in facts
+
+    def negates(self, name, fact):
+        return name in self.negators.get(fact, ())
+
+
+def _index_for(index, operators, init_name, init_state, P_flood, P_infra):
+    if index is None:
+        index = DomainIndex(operators, init_name, init_state, P_flood, P_infra)
+    return index
+
+
+def _bits(x):
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+class OrderingClosure:
+    """
+    Transitive closure of a plan's ordering constraints, one bitset row
+    per action id: after[a] holds everything forced after a, before[a]
+    everything forced before it. Immutable, so a rejected constraint is
+    rolled back by simply keeping the old closure.
+    """
+
+    __slots__ = ("after", "before")
+
+    def __init__(self, after, before):
+        self.after = after
+        self.before = before
+
+    @classmethod
+    def empty(cls, n):
+        return cls((0,) * n, (0,) * n)
+
+    def precedes(self, a, b):
+        return bool(self.after[a] >> b & 1)
+
+    def add(self, a, b):
+        """Closure with a < b added, or None if that would close a cycle (O(1) check)."""
+        if a == b or self.after[b] >> a & 1:
+            return None
+        if self.after[a] >> b & 1:
+            return self
+        up = self.before[a] | 1 << a
+        down = self.after[b] | 1 << b
+        after = list(self.after)
+        before = list(self.before)
+        for x in _bits(up):
+            after[x] |= down
+        for y in _bits(down):
+            before[y] |= up
+        return OrderingClosure(tuple(after), tuple(before))
+
+
+def topological_sort(ordering, all_nodes):
+    adj = {n:set() for n in all_nodes}
+    indeg = {n:0 for n in all_nodes}
+    for a,b in ordering:
+        if a in adj and b in adj:
+            adj[a].add(b); indeg[b]+=1
+    q = deque([n for n in all_nodes if indeg[n]==0])
+    out=[]
+    while q:
+        u=q.popleft(); out.append(u)
+        for v in list(adj[u]):
+            indeg[v]-=1
+            if indeg[v]==0:
+                q.append(v)
+    placed = set(out)
+    for n in all_nodes:
+        if n not in placed:
+            out.append(n)
+    return out
+
+
+def _cons_iter(lst):
+    """Items of a (head, tail) cons list, newest first."""
+    while lst is not None:
+        head, lst = lst
+        yield head
+
+
+class PlanNode:
+    """
+    Persistent partial plan. A child shares everything with its parent and
+    only allocates what it adds:
+
+        actions        int bitset over index.action_id
+        links          cons list of causal links (prov, fact, cons)
+        ordering       cons list of ordering constraints (before, after)
+        closure        OrderingClosure of those constraints
+        front, back    persistent FIFO of open preconditions (S, c):
+                       pop from the front list, push onto the back list
+
+    new_action is the provider the node added, if any; threats only need
+    checking for it and for the newest link. Nodes are never modified
+    once they have been handed to the search.
+    """
+
+    __slots__ = ("index", "actions", "links", "ordering", "closure", "front", "back",
+                 "n_open", "n_links", "new_action")
+
+    def __init__(self, index, actions, links, ordering, closure, front, back,
+                 n_open, n_links, new_action=None):
+        self.index = index
+        self.actions = actions
+        self.links = links
+        self.ordering = ordering
+        self.closure = closure
+        self.front = front
+        self.back = back
+        self.n_open = n_open
+        self.n_links = n_links
+        self.new_action = new_action
+
+    def has_action(self, name):
+        return bool(self.actions >> self.index.action_id[name] & 1)
+
+    def action_names(self):
+        bits, names = self.actions, self.index.names
+        return [names[i] for i in range(bits.bit_length()) if bits >> i & 1]
+
+    def iter_ordering(self):
+        return _cons_iter(self.ordering)
+
+    def iter_links(self):
+        return _cons_iter(self.links)
+
+    def iter_open(self):
+        yield from _cons_iter(self.front)
+        yield from reversed(list(_cons_iter(self.back)))
+
+    def pop_subgoal(self):
+        """(first open precondition, node without it), or None."""
+        if not self.n_open:
+            return None
+        front, back = self.front, self.back
+        if front is None:
+            for item in _cons_iter(back):
+                front = (item, front)
+            back = None
+        sub, front = front
+        rest = PlanNode(self.index, self.actions, self.links, self.ordering, self.closure,
+                        front, back, self.n_open - 1, self.n_links)
+        return sub, rest
+
+    def pop_open(self, i):
+        """(i-th open precondition in FIFO order, node without it)."""
+        items = list(self.iter_open())
+        sub = items.pop(i)
+        front = None
+        for item in reversed(items):
+            front = (item, front)
+        rest = PlanNode(self.index, self.actions, self.links, self.ordering, self.closure,
+                        front, None, self.n_open - 1, self.n_links)
+        return sub, rest
+
+    def canonical_key(self):
+        """Identical for plans that differ only in the order they were built."""
+        return (self.actions, self.closure.after, frozenset(self.iter_links()),
+                frozenset(self.iter_open()))
+
+    def child(self, prov, fact, consumer, preconds=()):
+        """
+        This plan plus one causal link, its ordering and, if new, the
+        provider. None if the link's ordering would close a cycle.
+        """
+        aid = self.index.action_id
+        closure = self.closure.add(aid[prov], aid[consumer])
+        if closure is None:
+            return None
+        ordering = ((prov, consumer), self.ordering)
+        actions, back, n_open = self.actions, self.back, self.n_open
+        new_action = None
+        if not self.has_action(prov):
+            new_action = prov
+            actions |= 1 << aid[prov]
+            closure = closure.add(aid[self.index.init_name], aid[prov])
+            if closure is None:
+                return None
+            ordering = ((self.index.init_name, prov), ordering)
+            for pre in preconds:
+                back = ((prov, pre), back)
+                n_open += 1
+        return PlanNode(self.index, actions, ((prov, fact, consumer), self.links),
+                        ordering, closure, self.front, back, n_open, self.n_links + 1,
+                        new_action)
+
+    def to_dict(self):
+        return {
+            "actions": set(self.action_names()),
+            "ordering": set(self.iter_ordering()),
+            "causal_links": list(self.iter_links())[::-1],
+            "open_preconds": deque(self.iter_open()),
+        }
+
+
+def Make_Minimal_Plan(initial_name, goal_action_names, operators, index=None):
+    if index is None:
+        index = DomainIndex(operators, initial_name, operators.get(initial_name, {}), P_flood, P_infra,
+                            goal_action_names)
+    aid = index.action_id
+    actions = 1 << aid[initial_name]
+    ordering = None
+    closure = OrderingClosure.empty(len(index.names))
+    back = None
+    n_open = 0
+    for g in goal_action_names:
+        actions |= 1 << index.action_id[g]
+        ordering = ((initial_name, g), ordering)
+        closure = closure.add(aid[initial_name], aid[g])
+        for ef in operators[g].get("effects", set()):
+            back = ((g, ef), back)
+            n_open += 1
+    return PlanNode(index, actions, None, ordering, closure, None, back, n_open, 0)
+
+
+def Select_Subgoal(plan, flaw="fifo", index=None):
+    """
+    Next open precondition and the plan without it, or None.
+    flaw="fifo" takes them in the order they were opened;
+    flaw="least_commitment" takes the one with the fewest providers first.
+    """
+    if not plan.n_open:
+        return None
+    if flaw == "fifo":
+        return plan.pop_subgoal()
+    index = index or plan.index
+    counts = [index.n_providers(c) for _, c in plan.iter_open()]
+    return plan.pop_open(counts.index(min(counts)))
+
+
+def h_open(plan, operators):
+    return plan.n_open
+
+
+def h_add(plan, operators):
+    """Sum of relaxed costs of the open preconditions."""
+    cost = plan.index.fact_costs(operators)
+    return sum(cost.get(c, float("inf")) for _, c in plan.iter_open())
+
+
+POP_HEURISTICS = {"open": h_open, "add": h_add}
+
+
+def Solution(plan, init_state, operators, P_flood, P_infra, index=None):
+   
+    # the ordering closure never admits a cycle, so only the links need checking
+    if plan.n_open:
+        return False
+    index = _index_for(index, operators, "start", init_state, P_flood, P_infra)
+    for prov, fact, cons in plan.iter_links():
+        if not index.provides(prov, fact):
+            return False
+    return True
+
+
+def find_providers(fact, operators, plan, init_name, init_state, P_flood, P_infra, index=None):
+    """
+    Candidate providers of `fact`: the initial state first, then actions
+    already in the plan, then new operators (each group in operator order).
+    """
+    index = _index_for(index, operators, init_name, init_state, P_flood, P_infra)
+    provs = [init_name] if fact in index.init_facts else []
+    candidates = index.providers.get(fact, ())
+    provs += [a for a in candidates if plan.has_action(a)]
+    provs += [a for a in candidates if not plan.has_action(a)]
+    return provs
+
+
+def Choose_Operator(plan, operators, S, c, init_name, init_state, P_flood, P_infra, index=None):
+    """Children of `plan` (already without subgoal (S, c)), one per provider of c."""
+    consumer = S; fact = c
+    providers = find_providers(fact, operators, plan, init_name, init_state, P_flood, P_infra, index)
+    children = []
+    for prov in providers:
+        preconds = operators[prov].get("preconditions", set()) if prov in operators else ()
+        child = plan.child(prov, fact, consumer, preconds)
+        if child is not None:
+            children.append(child)
+    return children
+
+
+def _new_threats(plan, index):
+    """
+    (action, link) threats a fresh child can add over its parent: actions
+    negating the newest link, and links negated by a newly added provider.
+    The parent had no unresolved threats and orderings only ever grow.
+    """
+    link = plan.links[0]
+    prov, fact, cons = link
+    for act in index.negators.get(fact, ()):
+        if act != prov and act != cons and plan.has_action(act):
+            yield act, link
+    act = plan.new_action
+    if act is not None:
+        for link in plan.iter_links():
+            if act != link[0] and act != link[2] and index.negates(act, link[1]):
+                yield act, link
+
+
+def Resolve_Threats(plan, operators, P_flood, P_infra, index=None):
+    """
+    Order every threatening action before the provider or after the
+    consumer of the link it threatens. `plan` must be a freshly created
+    child: the added constraints are pushed onto its own ordering.
+    """
+    index = index or plan.index
+    aid = index.action_id
+    ordering, closure = plan.ordering, plan.closure
+    for act, (prov, fact, cons) in list(_new_threats(plan, index)):
+        a, p, c = aid[act], aid[prov], aid[cons]
+        if closure.precedes(a, p) or closure.precedes(c, a):
+            continue
+        promoted = closure.add(a, p)
+        if promoted is not None:
+            closure, ordering = promoted, ((act, prov), ordering)
+            continue
+        demoted = closure.add(c, a)
+        if demoted is not None:
+            closure, ordering = demoted, ((cons, act), ordering)
+            continue
+        return False
+    plan.ordering, plan.closure = ordering, closure
+    return True
+
+
+def POP(initial_name, goal_action_names, operators, init_state, P_flood, P_infra, max_nodes=20000, debug=False,
+        strategy="dfs", heuristic="open", flaw="fifo", time_limit=None, max_frontier=None,
+        partial=False):
+    """
+    Partial-order planning; returns the plan in print_plan's dict form, or None.
+
+    strategy    "dfs" (depth-first, the original order) or "best_first"
+                (fewest estimated remaining steps first)
+    heuristic   "open" (open precondition count) or "add" (relaxed h_add),
+                or a callable h(plan, operators)
+    flaw        open-precondition selection, see Select_Subgoal
+    time_limit  wall-clock budget in seconds
+    max_frontier  cap on queued plans, a bound on search memory
+
+    Plans reached again through a different order of refinements are
+    dropped. When a budget (max_nodes, time_limit, max_frontier) runs out
+    with partial=True, the plan with the fewest open preconditions seen so
+    far is returned instead of None; its "open_preconds" are not empty.
+    """
+    index = DomainIndex(operators, initial_name, init_state, P_flood, P_infra, goal_action_names)
+    h = POP_HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+    root = Make_Minimal_Plan(initial_name, goal_action_names, operators, index)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    tie = itertools.count()
+
+    frontier = []
+    def push(plan):
+        if strategy == "dfs":
+            frontier.append(plan)
+        else:
+            heapq.heappush(frontier, (h(plan, operators), plan.n_links, next(tie), plan))
+    def pop():
+        return frontier.pop() if strategy == "dfs" else heapq.heappop(frontier)[-1]
+
+    push(root)
+    seen = {root.canonical_key()}
+    best = root
+    nodes = 0
+
+    while frontier:
+        if nodes >= max_nodes or (deadline is not None and time.perf_counter() > deadline) \
+                or (max_frontier is not None and len(frontier) > max_frontier):
+            if debug: print(f"Budget exhausted after {nodes} nodes.")
+            return best.to_dict() if partial else None
+        nodes += 1
+        plan = pop()
+        if plan.n_open < best.n_open:
+            best = plan
+        if debug:
+            print(f"[node {nodes}] actions={set(plan.action_names())}, open_preconds={plan.n_open}")
+        if Solution(plan, init_state, operators, P_flood, P_infra, index):
+            if debug: print("Solution found.")
+            return plan.to_dict()
+        sub = Select_Subgoal(plan, flaw, index)
+        if sub is None:
+            
+            if debug: print("No subgoal but not a solution, skipping node.")
+            continue
+        (S, c), plan = sub
+        if debug: print(f" Selected subgoal: {S}, {c}")
+        children = Choose_Operator(plan, operators, S, c, initial_name, init_state, P_flood, P_infra, index)
+        if not children:
+            if debug: print("  No providers for this subgoal -> dead end")
+            continue
+        
+        for child in children:
+            ok = Resolve_Threats(child, operators, P_flood, P_infra, index)
+            if not ok:
+                if debug: print("  Child had unresolvable threat -> skip")
+                continue
+            key = child.canonical_key()
+            if key in seen:
+                if debug: print("  Duplicate plan -> skip")
+                continue
+            seen.add(key)
+            push(child)
+ 
+    return None
+
+
+def print_plan(plan):
+    if plan is None:
+        print("No plan found.")
+        return
+    print("\n===== PLAN =====")
+    print("Actions (unordered):")
+    for a in plan["actions"]:
+        print(" -", a)
+    print("\nCausal links:")
+    for prov, fact, cons in plan.get("causal_links", []):
+        print(f"  ({prov}) -- {fact} --> ({cons})")
+    print("\nOrdering constraints:")
+    for b,a in plan.get("ordering", set()):
+        print("  ", b, "->", a)
+    print("\nOne valid linearization:")
+    seq = topological_sort(plan.get("ordering", set()), list(plan["actions"]))
+    for i,s in enumerate(seq, 1):
+        print(f"  {i}. {s}")
+    print("===============\n")
+
+
+
+def run_pop_module(P_flood=P_flood, P_infra=P_infra, **search_kwargs):
+    """
+    Solve the flood-preparedness POP problem for the given probabilities.
+    Returns: plan dict (see print_plan), or None
+    """
+    return POP(initial_name, goal_names, actions, init_state, P_flood, P_infra, **search_kwargs)
+
+
+
+if __name__ == "__main__":
+    print_plan(run_pop_module())
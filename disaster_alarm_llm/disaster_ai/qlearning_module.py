@@ -1,5 +1,8 @@
 
 
+import hashlib
+import json
+import os
 import numpy as np
 import random
 import pandas as pd
@@ -77,63 +80,384 @@ def reward(state, action):
 
 
 
+STATE_INDEX = {s: i for i, s in enumerate(STATES)}
+ACTION_INDEX = {a: i for i, a in enumerate(ACTIONS)}
+
+
+def compile_environment(states=STATES, actions=ACTIONS, next_state_fn=next_state, reward_fn=reward):
+    """
+    Precompute a deterministic environment as integer lookup tables:
+        T[s, a] -> next state id
+        R[s, a] -> reward
+    next_state_fn(state, action) must return one of `states`.
+    """
+    index = {s: i for i, s in enumerate(states)}
+    T = np.empty((len(states), len(actions)), dtype=np.int64)
+    R = np.empty((len(states), len(actions)), dtype=np.float64)
+    for i, s in enumerate(states):
+        for j, a in enumerate(actions):
+            nxt = next_state_fn(s, a)
+            if nxt not in index:
+                raise ValueError(f"next state {nxt!r} of ({s!r}, {a!r}) is not in states")
+            T[i, j] = index[nxt]
+            R[i, j] = reward_fn(s, a)
+    return T, R
+
+
+class ConvergenceMonitor:
+    """
+    Training telemetry, evaluated once per `window` finished episodes:
+        max_delta      max |ΔQ| since the previous window
+        policy_stable  greedy policy unchanged since the previous window
+        mean_return    mean undiscounted episode return in the window
+    Converged once max_delta < tol with a stable policy for `patience`
+    consecutive windows. Each window's metrics go to callback(metrics)
+    and are kept in self.history.
+    """
+
+    def __init__(self, Q, tol=None, window=50, patience=3, callback=None):
+        self.tol = tol
+        self.window = window
+        self.patience = patience
+        self.callback = callback
+        self.history = []
+        self.converged = False
+
+        self._snapshot = Q.copy()
+        self._policy = Q.argmax(axis=1)
+        self._streak = 0
+        self._returns = []
+        self._episodes = 0
+
+    def record(self, Q, returns):
+        """Add finished episode return(s). Returns True when training can stop."""
+        returns = np.atleast_1d(returns)
+        self._returns.extend(returns.tolist())
+        self._episodes += returns.size
+        if len(self._returns) < self.window:
+            return False
+
+        policy = Q.argmax(axis=1)
+        max_delta = float(np.abs(Q - self._snapshot).max())
+        stable = bool(np.array_equal(policy, self._policy))
+
+        if self.tol is not None and max_delta < self.tol and stable:
+            self._streak += 1
+        else:
+            self._streak = 0
+        self.converged = self._streak >= self.patience
+
+        metrics = {
+            "episode": self._episodes,
+            "max_delta": max_delta,
+            "policy_stable": stable,
+            "mean_return": float(np.mean(self._returns)),
+            "converged": self.converged,
+        }
+        self.history.append(metrics)
+        if self.callback is not None:
+            self.callback(metrics)
+
+        self._snapshot = Q.copy()
+        self._policy = policy
+        self._returns = []
+        return self.converged
+
+
+
 def train_qlearning(
         episodes=2000,
         alpha=0.1,
         gamma=0.9,
-        epsilon=0.1):
-    
-    Q = {s: {a: 0 for a in ACTIONS} for s in STATES}
-
-    for _ in range(episodes):
-        s = random.choice(STATES)
-
-        for __ in range(20):  # max steps per episode
+        epsilon=0.1,
+        max_steps=20,
+        seed=None,
+        Q=None,
+        tol=None,
+        window=50,
+        patience=3,
+        callback=None):
+    """
+    Tabular Q-learning on the compiled environment.
+    Returns Q as an array of shape (len(STATES), len(ACTIONS)).
+    Pass Q to continue training from an existing table.
+
+    With tol set, training stops early once ConvergenceMonitor reports
+    convergence; callback(metrics) receives telemetry every `window` episodes.
+    """
+    T, R = compile_environment()
+    n_states, n_actions = T.shape
+    rng = np.random.default_rng(seed)
+
+    Q = np.zeros((n_states, n_actions)) if Q is None else np.array(Q, dtype=np.float64)
+    starts = rng.integers(n_states, size=episodes)
+    monitor = ConvergenceMonitor(Q, tol, window, patience, callback)
+
+    for ep in range(episodes):
+        explore = rng.random(max_steps) < epsilon
+        random_actions = rng.integers(n_actions, size=max_steps)
+        s = starts[ep]
+        ep_return = 0.0
+
+        for t in range(max_steps):
             # ε-greedy choice
-            if random.random() < epsilon:
-                a = random.choice(ACTIONS)
-            else:
-                a = max(Q[s], key=Q[s].get)
+            a = random_actions[t] if explore[t] else Q[s].argmax()
 
-            r = reward(s, a)
-            s_next = next_state(s, a)
+            s_next = T[s, a]
+            ep_return += R[s, a]
 
             # Q-update
-            Q[s][a] += alpha * (r + gamma * max(Q[s_next].values()) - Q[s][a])
+            Q[s, a] += alpha * (R[s, a] + gamma * Q[s_next].max() - Q[s, a])
             s = s_next
 
-    return Q
+        if monitor.record(Q, ep_return):
+            break
 
+    return Q
 
-def save_qtable(Q, path="data/qtable.csv"):
-    df = pd.DataFrame(Q).T
-    df.to_csv(path)
 
-def load_qtable(path="data/qtable.csv"):
-    df = pd.read_csv(path, index_col=0)
-    return df.to_dict("index")
+def batched_td_update(Q, s, a, targets, alpha, weights=None):
+    """
+    Apply a batch of TD updates in place. Several environments can hit the
+    same (s, a) in one step; their TD errors are averaged into a single
+    update instead of the last write silently winning. Optional per-sample
+    weights (e.g. importance-sampling weights) scale each TD error.
+    Q must be a writable float array (any memory layout).
+    Returns the unweighted TD errors.
+    """
+    if not isinstance(Q, np.ndarray) or Q.dtype.kind != "f" or not Q.flags.writeable:
+        raise ValueError("Q must be a writable float array; copy it with "
+                         "np.array(Q, dtype=np.float64) first")
+    n_actions = Q.shape[1]
+    td = targets - Q[s, a]
+    uniq, inv = np.unique(s * n_actions + a, return_inverse=True)
+    sums = np.bincount(inv, weights=td if weights is None else td * weights)
+    counts = np.bincount(inv)
+    Q[uniq // n_actions, uniq % n_actions] += alpha * sums / counts
+    return td
+
+
+def train_qlearning_batched(
+        episodes=2000,
+        n_envs=64,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.1,
+        max_steps=20,
+        seed=None,
+        env=None,
+        tol=None,
+        window=None,
+        patience=3,
+        callback=None):
+    """
+    Q-learning with n_envs independent environments stepped in lock-step.
+    env is a (T, R) pair of lookup tables, default compile_environment().
+    Runs ceil(episodes / n_envs) rounds of max_steps batched steps.
+    Early stopping and telemetry work as in train_qlearning; the window
+    defaults to one round (n_envs episodes).
+    """
+    T, R = env if env is not None else compile_environment()
+    n_states, n_actions = T.shape
+    rng = np.random.default_rng(seed)
+
+    Q = np.zeros((n_states, n_actions))
+    rounds = -(-episodes // n_envs)
+    monitor = ConvergenceMonitor(Q, tol, window or n_envs, patience, callback)
+
+    for _ in range(rounds):
+        s = rng.integers(n_states, size=n_envs)
+        returns = np.zeros(n_envs)
+
+        for __ in range(max_steps):
+            # vectorized ε-greedy choice
+            greedy = Q[s].argmax(axis=1)
+            explore = rng.random(n_envs) < epsilon
+            a = np.where(explore, rng.integers(n_actions, size=n_envs), greedy)
+
+            s_next = T[s, a]
+            returns += R[s, a]
+            targets = R[s, a] + gamma * Q[s_next].max(axis=1)
+            batched_td_update(Q, s, a, targets, alpha)
+            s = s_next
 
+        if monitor.record(Q, returns):
+            break
 
+    return Q
 
-def extract_best_action(Q):
 
-    return max(Q[state], key=Q[state].get)
+def greedy_return(Q, env=None, gamma=0.9, horizon=20):
+    """
+    Mean discounted return of the greedy policy of Q over `horizon` steps,
+    averaged over all start states.
+    """
+    T, R = env if env is not None else compile_environment()
+    policy = Q.argmax(axis=1)
+    s = np.arange(T.shape[0])
+    total = np.zeros(T.shape[0])
+    for t in range(horizon):
+        a = policy[s]
+        total += gamma ** t * R[s, a]
+        s = T[s, a]
+    return float(total.mean())
+
+
+def qtable_as_dict(Q):
+    return {s: {a: float(Q[i, j]) for j, a in enumerate(ACTIONS)}
+            for i, s in enumerate(STATES)}
+
+
+# save_qtable_binary / load_qtable_binary (data/qtable.npy) are the stored
+# format run_qlearning_module and the sweep use; the CSV pair below is only
+# a human-readable export / import, with no metadata or staleness check.
+def save_qtable(Q, path):
+    if isinstance(Q, np.ndarray):
+        df = pd.DataFrame(Q, index=STATES, columns=ACTIONS)
+    else:
+        df = pd.DataFrame(Q).T
+    df.to_csv(path)
 
+def load_qtable(path):
+    df = pd.read_csv(path, index_col=0)
+    return df.reindex(index=STATES, columns=ACTIONS).to_numpy(dtype=np.float64)
 
 
-def run_qlearning_module(train_if_missing=True):
 
-    import os
+RISK_LEVELS = ["LowRisk", "MedRisk", "HighRisk"]
+RESOURCE_LEVELS = ["LowRes", "MidRes", "HighRes"]
 
-    qpath = "data/qtable.csv"
+# (risk level, resource level) -> state id
+LEVEL_STATE = np.array([[STATE_INDEX[f"{r}_{res}"] for res in RESOURCE_LEVELS]
+                        for r in RISK_LEVELS])
+_ACTION_NAMES = np.array(ACTIONS)
 
-    if os.path.exists(qpath):
-        Q = load_qtable(qpath)
-    else:
-        Q = train_qlearning()
-        save_qtable(Q, qpath)
 
-    best = extract_best_action(Q)
+def states_from_readings(risk, resources, capacity=1.0,
+                         risk_edges=(1 / 3, 2 / 3), resource_edges=(1 / 3, 2 / 3)):
+    """
+    Map raw readings to state ids, element-wise:
+        risk       hazard probability in [0, 1], e.g. P(Flood)
+        resources  available resources, as a fraction of `capacity`
+    """
+    r = np.digitize(np.asarray(risk, dtype=np.float64), risk_edges)
+    res = np.digitize(np.asarray(resources, dtype=np.float64) / capacity, resource_edges)
+    return LEVEL_STATE[r, res]
+
+
+def state_ids(states):
+    """Accepts state ids or state names (scalar or sequence)."""
+    states = np.asarray(states)
+    if states.dtype.kind in "US":
+        return np.vectorize(STATE_INDEX.__getitem__, otypes=[np.int64])(states)
+    return states.astype(np.int64)
+
+
+def greedy_policy(Q, states):
+    """
+    Greedy actions for many states in one call.
+    Returns (action names, action ids, Q-values of those actions).
+    """
+    ids = state_ids(states)
+    q = np.asarray(Q)[ids]
+    a = q.argmax(axis=-1)
+    return _ACTION_NAMES[a], a, np.take_along_axis(q, a[..., None], axis=-1)[..., 0]
+
+
+def policy_for_readings(Q, risk, resources, capacity=1.0):
+    """greedy_policy for raw per-district readings."""
+    return greedy_policy(Q, states_from_readings(risk, resources, capacity))
+
+
+def extract_best_action(Q, state="MedRisk_MidRes"):
+    names, _, _ = greedy_policy(Q, state)
+    return str(names)
+
+
+
+QTABLE_FORMAT_VERSION = 1
+
+TRAINING_DEFAULTS = dict(episodes=2000, alpha=0.1, gamma=0.9, epsilon=0.1, max_steps=20)
+
+
+def environment_fingerprint(states=STATES, actions=ACTIONS):
+    """
+    Hash of the state/action vocabularies and the compiled T/R tables, so
+    any behavioural change to next_state or reward changes the fingerprint.
+    """
+    T, R = compile_environment(states, actions)
+    h = hashlib.sha256()
+    h.update(json.dumps([list(states), list(actions)]).encode())
+    h.update(T.astype("<i8").tobytes())
+    h.update(R.astype("<f8").tobytes())
+    return h.hexdigest()
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + ".meta.json"
+
+
+def save_qtable_binary(Q, path="data/qtable.npy", hyperparams=None, telemetry=None):
+    """
+    Write Q as a raw .npy array plus a JSON header next to it
+    (<name>.meta.json) holding vocabularies, hyperparameters, the
+    environment fingerprint and the last training telemetry.
+    """
+    Q = np.ascontiguousarray(Q, dtype=np.float64)
+    np.save(path, Q)
+    meta = {
+        "format_version": QTABLE_FORMAT_VERSION,
+        "states": list(STATES),
+        "actions": list(ACTIONS),
+        "shape": list(Q.shape),
+        "hyperparams": hyperparams or {},
+        "env_hash": environment_fingerprint(),
+        "telemetry": telemetry,
+    }
+    with open(_meta_path(path), "w") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+def load_qtable_binary(path="data/qtable.npy", mmap=True):
+    """
+    Returns (Q, meta). With mmap the table is memory-mapped read-only, so
+    large tables are paged in on demand instead of loaded up front.
+    """
+    Q = np.load(path, mmap_mode="r" if mmap else None)
+    with open(_meta_path(path)) as f:
+        meta = json.load(f)
+    return Q, meta
+
+
+def is_stale(meta):
+    return (meta.get("format_version") != QTABLE_FORMAT_VERSION
+            or meta.get("states") != list(STATES)
+            or meta.get("actions") != list(ACTIONS)
+            or meta.get("env_hash") != environment_fingerprint())
+
+
+def run_qlearning_module(train_if_missing=True, qpath="data/qtable.npy", state="MedRisk_MidRes"):
+    """
+    Load the stored Q-table, retraining when it is missing or was trained
+    against a different environment definition.
+    Returns the greedy action for `state`.
+    """
+    Q = None
+    if os.path.exists(qpath) and os.path.exists(_meta_path(qpath)):
+        Q, meta = load_qtable_binary(qpath)
+        if is_stale(meta):
+            Q = None
+
+    if Q is None:
+        if not train_if_missing:
+            raise FileNotFoundError(f"No up-to-date Q-table at {qpath}")
+        history = []
+        Q = train_qlearning(**TRAINING_DEFAULTS, callback=history.append)
+        save_qtable_binary(Q, qpath, hyperparams=TRAINING_DEFAULTS,
+                           telemetry=history[-1] if history else None)
+
+    best = extract_best_action(Q, state)
     return best
 
 
@@ -0,0 +1,250 @@
+
+import json
+import os
+import time
+
+import numpy as np
+
+from disaster_ai.qlearning_module import (
+    STATES, ACTIONS, STATE_INDEX, ACTION_INDEX, batched_td_update
+)
+
+
+class SumTree:
+    """
+    Array-backed sum tree over `capacity` leaf priorities. Batched
+    updates and prefix-sum lookups walk all levels at once for the whole
+    batch, O(batch * log capacity).
+    """
+
+    def __init__(self, capacity):
+        self.leaves = 1 << max(1, int(np.ceil(np.log2(capacity))))
+        self.depth = int(np.log2(self.leaves))
+        self.tree = np.zeros(2 * self.leaves)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, idx, values):
+        nodes = np.asarray(idx) + self.leaves
+        self.tree[nodes] = values
+        # all leaves sit at the same depth, so one pass per level reaches the root
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, u):
+        """Leaf index whose prefix-sum interval contains each u in [0, total)."""
+        node = np.ones(len(u), dtype=np.int64)
+        u = np.array(u, dtype=np.float64)
+        for _ in range(self.depth):
+            left = 2 * node
+            go_right = u >= self.tree[left]
+            u = np.where(go_right, u - self.tree[left], u)
+            node = np.where(go_right, left + 1, left)
+        return node - self.leaves
+
+
+class ReplayBuffer:
+    """
+    Ring buffer of transitions in preallocated arrays (s, a, r, s', done)
+    with proportional prioritized sampling: P(i) ~ priority_i ** alpha.
+    alpha=0 gives uniform sampling.
+    """
+
+    def __init__(self, capacity, alpha=0.6, eps=1e-3):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.eps = eps
+        self.s = np.zeros(capacity, dtype=np.int64)
+        self.a = np.zeros(capacity, dtype=np.int64)
+        self.r = np.zeros(capacity, dtype=np.float64)
+        self.s_next = np.zeros(capacity, dtype=np.int64)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+        self.pos = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, s, a, r, s_next, done=False):
+        """Append one transition or a batch (array arguments); oldest are overwritten."""
+        s, a, r, s_next, done = np.broadcast_arrays(
+            np.atleast_1d(s), a, r, s_next, done)
+        n = len(s)
+        if n > self.capacity:
+            s, a, r, s_next, done = (x[-self.capacity:] for x in (s, a, r, s_next, done))
+            n = self.capacity
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.s[idx] = s
+        self.a[idx] = a
+        self.r[idx] = r
+        self.s_next[idx] = s_next
+        self.done[idx] = done
+        # new transitions get the max priority so they are seen at least once
+        self.tree.update(idx, self.max_priority ** self.alpha)
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return idx
+
+    def sample(self, batch_size, rng, beta=0.4):
+        """
+        Returns (idx, (s, a, r, s_next, done), weights); weights are the
+        normalised importance-sampling corrections for the priority bias.
+        """
+        total = self.tree.total
+        u = (np.arange(batch_size) + rng.random(batch_size)) * (total / batch_size)
+        idx = np.minimum(self.tree.find(u), self.size - 1)
+
+        p = self.tree.tree[idx + self.tree.leaves] / total
+        weights = (self.size * p) ** -beta
+        weights /= weights.max()
+        batch = (self.s[idx], self.a[idx], self.r[idx], self.s_next[idx], self.done[idx])
+        return idx, batch, weights
+
+    def update_priorities(self, idx, td_errors):
+        priorities = np.abs(td_errors) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(idx, priorities ** self.alpha)
+
+
+# ------------------------------------------------------------------
+# Append-only on-disk log of real dispatch decisions
+# ------------------------------------------------------------------
+LOG_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("state", "<i4"),
+    ("action", "<i4"),
+    ("reward", "<f8"),
+    ("next_state", "<i4"),
+    ("done", "?"),
+])
+
+
+class DecisionLog:
+    """
+    Fixed-width binary records appended to one file. Reading goes through
+    np.memmap, so chunks are paged in from disk on demand and years of
+    logs never have to fit in RAM. A <name>.meta.json header pins the
+    state/action vocabularies the ids refer to.
+    """
+
+    def __init__(self, path="data/decisions.log"):
+        self.path = path
+        self.meta_path = os.path.splitext(path)[0] + ".meta.json"
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta["states"] != list(STATES) or meta["actions"] != list(ACTIONS):
+                raise ValueError(f"{path} was logged with a different state/action vocabulary")
+
+    def append(self, state, action, reward, next_state, done=False, timestamp=None):
+        """Log one decision or a batch; states/actions may be names or ids."""
+        state, next_state = _ids(state, STATE_INDEX), _ids(next_state, STATE_INDEX)
+        action = _ids(action, ACTION_INDEX)
+        n = len(state)
+        rec = np.empty(n, dtype=LOG_DTYPE)
+        rec["timestamp"] = time.time() if timestamp is None else timestamp
+        rec["state"] = state
+        rec["action"] = action
+        rec["reward"] = reward
+        rec["next_state"] = next_state
+        rec["done"] = done
+        if not os.path.exists(self.meta_path):
+            with open(self.meta_path, "w") as f:
+                json.dump({"states": list(STATES), "actions": list(ACTIONS),
+                           "dtype": LOG_DTYPE.descr}, f, indent=2)
+        with open(self.path, "ab") as f:
+            f.write(rec.tobytes())
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // LOG_DTYPE.itemsize
+
+    def chunks(self, chunk_size=1 << 16):
+        n = len(self)
+        if n == 0:
+            return
+        records = np.memmap(self.path, dtype=LOG_DTYPE, mode="r", shape=(n,))
+        for lo in range(0, n, chunk_size):
+            yield np.array(records[lo:lo + chunk_size])
+
+
+def _ids(values, index):
+    values = np.atleast_1d(np.asarray(values))
+    if values.dtype.kind in "US":
+        return np.array([index[v] for v in values], dtype=np.int64)
+    return values.astype(np.int64)
+
+
+# ------------------------------------------------------------------
+# Offline training
+# ------------------------------------------------------------------
+def _updates_from_buffer(Q, buffer, updates, batch_size, alpha, gamma, beta, rng):
+    for _ in range(updates):
+        idx, (s, a, r, s_next, done), w = buffer.sample(batch_size, rng, beta)
+        targets = r + gamma * np.where(done, 0.0, Q[s_next].max(axis=1))
+        td = batched_td_update(Q, s, a, targets, alpha, weights=w)
+        buffer.update_priorities(idx, td)
+
+
+def train_from_buffer(Q, buffer, updates=1000, batch_size=256, alpha=0.1,
+                      gamma=0.9, beta=0.4, seed=None):
+    """
+    Prioritized batched Q-updates drawn from a ReplayBuffer.
+    Trains and returns a copy of Q; the table passed in is left untouched.
+    """
+    Q = np.array(Q, dtype=np.float64, order="C")
+    _updates_from_buffer(Q, buffer, updates, batch_size, alpha, gamma, beta,
+                         np.random.default_rng(seed))
+    return Q
+
+
+def train_offline(log, Q=None, epochs=1, chunk_size=1 << 16, buffer_size=1 << 16,
+                  updates_per_chunk=256, batch_size=256, alpha=0.1, gamma=0.9,
+                  beta=0.4, seed=None):
+    """
+    Offline Q-learning from a DecisionLog. The log is streamed chunk by
+    chunk into a bounded replay buffer, and each chunk is followed by
+    prioritized batched updates; memory use is set by chunk_size and
+    buffer_size, not by the size of the log. Pass Q to continue from an
+    existing table; it is copied, not modified.
+    """
+    if Q is None:
+        Q = np.zeros((len(STATES), len(ACTIONS)))
+    else:
+        Q = np.array(Q, dtype=np.float64, order="C")
+    rng = np.random.default_rng(seed)
+    buffer = ReplayBuffer(buffer_size)
+    for _ in range(epochs):
+        for rec in log.chunks(chunk_size):
+            buffer.add(rec["state"], rec["action"], rec["reward"],
+                       rec["next_state"], rec["done"])
+            _updates_from_buffer(Q, buffer, updates_per_chunk, batch_size,
+                                 alpha, gamma, beta, rng)
+    return Q
+
+
+def run_replay_module(log_path="data/decisions.log"):
+    """
+    Train a Q-table from the logged dispatch decisions.
+    Returns Q, or None when nothing has been logged yet.
+    """
+    log = DecisionLog(log_path)
+    if len(log) == 0:
+        return None
+    return train_offline(log)
+
+
+
+if __name__ == "__main__":
+    Q = run_replay_module()
+    if Q is None:
+        print("\nNo logged decisions yet.")
+    else:
+        print("\nOffline Q-table:")
+        print(Q)
@@ -0,0 +1,147 @@
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from disaster_ai import pop_module
+from disaster_ai.pop_module import POP, eval_effect_value
+
+
+def _plan_default_domain(job):
+    """Worker: solve the pop_module operators at one (P_flood, P_infra) point."""
+    p_flood, p_infra, initial_name, goal_names, search_kwargs = job
+    return POP(initial_name, goal_names, pop_module.actions, pop_module.init_state,
+               p_flood, p_infra, **search_kwargs)
+
+
+class ScenarioPlanner:
+    """
+    POP plans cached per region of the (P_flood, P_infra) square.
+
+    The probabilities only reach POP through the effect lambdas, so two
+    points whose lambdas all evaluate the same have identical resolved
+    facts and therefore the same plan. signature() is that tuple of
+    lambda results; plan() is a dictionary lookup on it and only runs POP
+    for a region it has not seen. precompute() solves every region of a
+    grid up front, uncached regions in parallel.
+
+    Effect lambdas cannot be pickled, so the process pool is only used
+    with the pop_module operators and initial state (initial_name and
+    goal_names are passed to the workers); custom operators or a custom
+    init_state are solved in process. Cache keys include the initial and
+    goal names along with the signature.
+    """
+
+    def __init__(self, operators=None, init_state=None, initial_name=None,
+                 goal_names=None, processes=None, **search_kwargs):
+        self.custom = operators is not None or init_state is not None
+        self.operators = pop_module.actions if operators is None else operators
+        self.init_state = pop_module.init_state if init_state is None else init_state
+        self.initial_name = initial_name or pop_module.initial_name
+        self.goal_names = list(goal_names or pop_module.goal_names)
+        self.processes = processes
+        self.search_kwargs = search_kwargs
+        self.cache = {}
+
+        # every effect that depends on the probabilities, in a fixed order
+        self._lambdas = []
+        sources = [self.init_state] + [op for name, op in self.operators.items()
+                                       if name != self.initial_name]
+        for op in sources:
+            for fact, val in sorted(op.get("effects", ()), key=lambda e: e[0]):
+                if callable(val):
+                    self._lambdas.append(val)
+
+    def signature(self, P_flood, P_infra):
+        return tuple(eval_effect_value(fn, P_flood, P_infra) for fn in self._lambdas)
+
+    def key(self, P_flood, P_infra):
+        return self._key(self.signature(P_flood, P_infra))
+
+    def _key(self, signature):
+        return (self.initial_name, tuple(self.goal_names), signature)
+
+    def _job(self, P_flood, P_infra):
+        return (P_flood, P_infra, self.initial_name, self.goal_names, self.search_kwargs)
+
+    def _solve(self, P_flood, P_infra):
+        if self.custom:
+            return POP(self.initial_name, self.goal_names, self.operators, self.init_state,
+                       P_flood, P_infra, **self.search_kwargs)
+        return _plan_default_domain(self._job(P_flood, P_infra))
+
+    def plan(self, P_flood, P_infra):
+        key = self.key(P_flood, P_infra)
+        if key not in self.cache:
+            self.cache[key] = self._solve(P_flood, P_infra)
+        return self.cache[key]
+
+    def plan_for_posteriors(self, bayes):
+        """Plan for a run_bayesian_module result; bridge collapse stands in for P_infra."""
+        return self.plan(bayes.get("Flood", pop_module.P_flood),
+                         bayes.get("Bridge_Collapse", pop_module.P_infra))
+
+    def partition(self, resolution=101):
+        """
+        Regions of a resolution x resolution grid over [0, 1]^2:
+            {signature: {"points", "p_flood": (lo, hi), "p_infra": (lo, hi), "point"}}
+        The bounds are those of the grid points in the region; "point" is
+        one of them, used to plan the region.
+        """
+        grid = np.linspace(0.0, 1.0, resolution)
+        regions = {}
+        for pf in grid:
+            for pi in grid:
+                key = self.signature(float(pf), float(pi))
+                r = regions.get(key)
+                if r is None:
+                    regions[key] = {"points": 1, "p_flood": (pf, pf), "p_infra": (pi, pi),
+                                    "point": (float(pf), float(pi))}
+                else:
+                    r["points"] += 1
+                    r["p_flood"] = (min(r["p_flood"][0], pf), max(r["p_flood"][1], pf))
+                    r["p_infra"] = (min(r["p_infra"][0], pi), max(r["p_infra"][1], pi))
+        for r in regions.values():
+            r["p_flood"] = tuple(map(float, r["p_flood"]))
+            r["p_infra"] = tuple(map(float, r["p_infra"]))
+        return regions
+
+    def precompute(self, resolution=101):
+        """Plan every region of the grid that is not cached yet. Returns the regions."""
+        regions = self.partition(resolution)
+        todo = [(self._key(sig), r["point"]) for sig, r in regions.items()
+                if self._key(sig) not in self.cache]
+        if not todo:
+            return regions
+
+        if self.custom or self.processes == 1 or len(todo) == 1:
+            plans = [self._solve(pf, pi) for _, (pf, pi) in todo]
+        else:
+            jobs = [self._job(pf, pi) for _, (pf, pi) in todo]
+            workers = min(len(jobs), self.processes or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                plans = list(pool.map(_plan_default_domain, jobs))
+
+        for (key, _), plan in zip(todo, plans):
+            self.cache[key] = plan
+        return regions
+
+
+def run_scenario_module(bayes=None, resolution=101, processes=None):
+    """
+    Precompute POP plans for every (P_flood, P_infra) region, then look up
+    the plan for the given posteriors.
+    Returns: (plan dict or None, number of regions)
+    """
+    planner = ScenarioPlanner(processes=processes)
+    regions = planner.precompute(resolution)
+    plan = planner.plan_for_posteriors(bayes or {"Flood": 0.55, "Bridge_Collapse": 0.8})
+    return plan, len(regions)
+
+
+
+if __name__ == "__main__":
+    plan, n_regions = run_scenario_module()
+    print(f"\nPlanned {n_regions} (P_flood, P_infra) regions.")
+    pop_module.print_plan(plan)
@@ -0,0 +1,176 @@
+
+import heapq
+from collections import defaultdict
+
+from disaster_ai import pop_module
+
+
+TEAM_KEYWORDS = (
+    ("rescue", ("rescue", "evacuate", "deploy")),
+    ("comm", ("comm", "communication", "route", "shift")),
+    ("medical", ("med", "stock", "supply", "medical")),
+)
+
+DEFAULT_CAPACITIES = {"rescue": 1, "comm": 1, "medical": 1, "other": 1}
+
+
+def team_of(action):
+    """Team responsible for an action, by the same name rules as the POP visualizations."""
+    lname = action.lower()
+    for team, keys in TEAM_KEYWORDS:
+        if any(k in lname for k in keys):
+            return team
+    return "other"
+
+
+def _graph(actions, ordering):
+    succ = {a: [] for a in actions}
+    preds = {a: [] for a in actions}
+    for b, a in set(ordering):
+        if b in succ and a in succ and b != a:
+            succ[b].append(a)
+            preds[a].append(b)
+    order = pop_module.topological_sort(
+        [(b, a) for b in succ for a in succ[b]], sorted(actions))
+    return succ, preds, order
+
+
+def schedule_plan(plan, durations=None, teams=None, capacities=None, milestones=None,
+                  default_duration=1.0):
+    """
+    Resource-constrained parallel schedule for a POP plan (dict form).
+
+    durations   {action: time}, default_duration otherwise
+    teams       {action: team}, team_of() otherwise
+    capacities  {team: actions the team can run at once}, 1 otherwise
+    milestones  zero-duration actions that use no team; defaults to the
+                pop_module start and goal states
+
+    Actions are list-scheduled in order of their critical-path priority
+    (longest remaining duration chain to the end of the plan), each on
+    the team slot that frees up first, never before its predecessors
+    finish. O((V + E) log V).
+
+    Returns {
+        "start", "finish", "team", "slot":  per action
+        "makespan":       finish time of the whole plan
+        "lower_bound":    longest precedence chain, ignoring capacities
+        "critical_path":  chain of binding precedence/team constraints
+                          ending at the last action to finish
+        "goal_times":     finish time of every milestone
+        "lanes":          {(team, slot): [(action, start, finish), ...]}
+    }
+    """
+    durations = durations or {}
+    teams = teams or {}
+    capacities = {**DEFAULT_CAPACITIES, **(capacities or {})}
+    if milestones is None:
+        milestones = {pop_module.initial_name, *pop_module.goal_names}
+
+    actions = set(plan["actions"])
+    succ, preds, order = _graph(actions, plan["ordering"])
+
+    dur = {a: 0.0 if a in milestones else float(durations.get(a, default_duration))
+           for a in actions}
+    team = {a: None if a in milestones else teams.get(a) or team_of(a) for a in actions}
+
+    # critical-path priority: longest chain from a to any sink
+    tail = {}
+    for a in reversed(order):
+        tail[a] = dur[a] + max((tail[b] for b in succ[a]), default=0.0)
+    # precedence-only earliest finish, for the lower bound
+    early = {}
+    for a in order:
+        early[a] = dur[a] + max((early[p] for p in preds[a]), default=0.0)
+
+    slots = {}
+    start, finish, slot_of, cause = {}, {}, {}, {}
+    last_in_slot = {}
+    waiting = {a: len(preds[a]) for a in actions}
+    ready = [(-tail[a], a) for a in actions if not waiting[a]]
+    heapq.heapify(ready)
+
+    while ready:
+        _, a = heapq.heappop(ready)
+        release, binding = 0.0, None
+        for p in preds[a]:
+            if binding is None or finish[p] > release:
+                release, binding = finish[p], p
+
+        t = team[a]
+        if t is None:
+            s, slot = release, None
+        else:
+            free = slots.get(t)
+            if free is None:
+                free = slots[t] = [(0.0, k) for k in range(max(1, capacities.get(t, 1)))]
+            free_at, k = heapq.heappop(free)
+            s, slot = max(release, free_at), (t, k)
+            if free_at > release and slot in last_in_slot:
+                binding = last_in_slot[slot]
+            heapq.heappush(free, (s + dur[a], k))
+            last_in_slot[slot] = a
+
+        start[a], finish[a], slot_of[a], cause[a] = s, s + dur[a], slot, binding
+        for b in succ[a]:
+            waiting[b] -= 1
+            if not waiting[b]:
+                heapq.heappush(ready, (-tail[b], b))
+
+    makespan = max(finish.values(), default=0.0)
+    path = []
+    a = max(finish, key=lambda x: (finish[x], -start[x]), default=None)
+    while a is not None:
+        path.append(a)
+        a = cause[a]
+
+    lanes = defaultdict(list)
+    for a in sorted(actions, key=lambda x: (start[x], x)):
+        if slot_of[a] is not None:
+            lanes[slot_of[a]].append((a, start[a], finish[a]))
+
+    return {
+        "start": start,
+        "finish": finish,
+        "team": team,
+        "slot": slot_of,
+        "makespan": makespan,
+        "lower_bound": max(early.values(), default=0.0),
+        "critical_path": path[::-1],
+        "goal_times": {m: finish[m] for m in milestones if m in finish},
+        "lanes": dict(lanes),
+    }
+
+
+def print_schedule(schedule):
+    print("\n===== SCHEDULE =====")
+    for (team, k), items in sorted(schedule["lanes"].items()):
+        print(f"{team.upper()} #{k + 1}:")
+        for a, s, f in items:
+            print(f"  {s:6.1f} - {f:6.1f}  {a}")
+    print("\nGoal states met at:")
+    for g, t in sorted(schedule["goal_times"].items(), key=lambda x: x[1]):
+        print(f"  {t:6.1f}  {g}")
+    print(f"\nMakespan: {schedule['makespan']:.1f} (precedence bound {schedule['lower_bound']:.1f})")
+    print("Critical path:", " -> ".join(schedule["critical_path"]))
+    print("====================\n")
+
+
+def run_schedule_module(plan=None, durations=None, capacities=None):
+    """
+    Parallel team schedule for the POP plan.
+    Returns: schedule dict (see schedule_plan), or None when there is no plan
+    """
+    plan = plan if plan is not None else pop_module.run_pop_module()
+    if plan is None:
+        return None
+    return schedule_plan(plan, durations, capacities=capacities)
+
+
+
+if __name__ == "__main__":
+    schedule = run_schedule_module()
+    if schedule is None:
+        print("No plan found.")
+    else:
+        print_schedule(schedule)
@@ -89,13 +89,30 @@ class MultiModalGraph:
         
         self.node_risk = defaultdict(lambda: 1.0)
         self.node_blocked = defaultdict(lambda: False)
+        self.node_type = {}
+
+        self._risk_listeners = []
 
     def add_node(self, name, xy, node_type):
         self.coords[name] = tuple(map(float, xy))
+        self.node_type[name] = node_type
 
     def set_node_risk(self, name, risk_score=1.0, calamity=False):
         self.node_risk[name] = float("inf") if calamity else float(risk_score)
         self.node_blocked[name] = bool(calamity)
+        for callback in self._risk_listeners:
+            callback(name)
+
+    def add_risk_listener(self, callback):
+        # callback(name) is invoked after every set_node_risk
+        self._risk_listeners.append(callback)
+
+    def remove_risk_listener(self, callback):
+        if callback in self._risk_listeners:
+            self._risk_listeners.remove(callback)
+
+    def nodes_of_type(self, node_type):
+        return [n for n, t in self.node_type.items() if t == node_type]
 
     def _euclid(self, u, v):
         (x1, y1) = self.coords[u]
@@ -370,6 +387,176 @@ def astar(graph: MultiModalGraph, start, goal, **weight_kwargs):
     path = _reconstruct_path(came_from, goal)
     return path, g_cost[goal], _extract_modes(graph, path)
 
+# Pure travel-time weights (minutes) for isochrones.
+TRAVEL_TIME_WEIGHTS = dict(w_time=1.0, w_cost=0.0, w_delay=0.0, w_discomfort=0.0)
+
+
+class Isochrones:
+    """
+    Bounded multi-source Dijkstra from a set of facilities (hospitals,
+    shelters). One sweep gives, for every reachable node, the earliest
+    arrival and the facility that reaches it first.
+
+    The result is kept up to date when set_node_risk blocks or unblocks
+    nodes: only the shortest-path subtrees hanging off the changed nodes
+    are recomputed. Edge weights are read once, at construction; after
+    add_edge or other edge changes call rebuild().
+
+    The instance listens to the graph until close() is called, so use it
+    as a context manager or close it when done. Weight keywords override
+    TRAVEL_TIME_WEIGHTS one by one.
+    """
+
+    def __init__(self, graph: MultiModalGraph, sources, max_cost=math.inf, **weight_kwargs):
+        self.graph = graph
+        self.sources = list(sources)
+        self.max_cost = float(max_cost)
+        self.weight_kwargs = {**TRAVEL_TIME_WEIGHTS, **weight_kwargs}
+
+        self.arrival = {}
+        self.owner = {}
+        self.parent = {}
+
+        self._blocked = {}
+        self._dirty = set()
+        self._listener = self._dirty.add
+        graph.add_risk_listener(self._listener)
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-read every edge weight and redo the full sweep."""
+        # refresh() assumes the weights stay fixed; only node blocking changes.
+        self._out = {}
+        self._in = defaultdict(list)
+        for u, edges in self.graph.adj.items():
+            out = []
+            for e in edges:
+                w = edge_weight(e, **self.weight_kwargs)
+                out.append((e["to"], w))
+                self._in[e["to"]].append((u, w))
+            self._out[u] = out
+        self._dirty.clear()
+        self._full_sweep()
+
+    def close(self):
+        """Stop listening for set_node_risk changes."""
+        self.graph.remove_risk_listener(self._listener)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _full_sweep(self):
+        self.arrival.clear()
+        self.owner.clear()
+        self.parent.clear()
+        self._blocked = {n: self.graph.node_blocked[n] for n in self.graph.coords}
+        frontier = []
+        for s in self.sources:
+            if not self._blocked.get(s, False):
+                self.arrival[s] = 0.0
+                self.owner[s] = s
+                self.parent[s] = None
+                frontier.append((0.0, s))
+        heapq.heapify(frontier)
+        self._dijkstra(frontier)
+
+    def _dijkstra(self, frontier):
+        arrival, owner, parent = self.arrival, self.owner, self.parent
+        blocked = self._blocked
+        while frontier:
+            d, u = heapq.heappop(frontier)
+            if d > arrival.get(u, math.inf):
+                continue
+            for v, w in self._out.get(u, ()):
+                if blocked.get(v, False):
+                    continue
+                nd = d + w
+                if nd <= self.max_cost and nd < arrival.get(v, math.inf):
+                    arrival[v] = nd
+                    owner[v] = owner[u]
+                    parent[v] = u
+                    heapq.heappush(frontier, (nd, v))
+
+    def refresh(self):
+        """Apply pending set_node_risk changes. Returns the set of touched nodes."""
+        changed = {n for n in self._dirty
+                   if self.graph.node_blocked[n] != self._blocked.get(n, False)}
+        self._dirty.clear()
+        if not changed:
+            return set()
+
+        for n in changed:
+            self._blocked[n] = self.graph.node_blocked[n]
+
+        # Everything whose shortest path ran through a newly blocked node.
+        children = defaultdict(list)
+        for v, p in self.parent.items():
+            if p is not None:
+                children[p].append(v)
+        stack = [n for n in changed if self._blocked[n] and n in self.arrival]
+        invalid = set()
+        while stack:
+            u = stack.pop()
+            if u in invalid:
+                continue
+            invalid.add(u)
+            stack.extend(children[u])
+        for n in invalid:
+            del self.arrival[n], self.owner[n], self.parent[n]
+
+        # Re-seed invalidated and newly unblocked nodes from their settled neighbours.
+        source_set = set(self.sources)
+        seeds = [n for n in invalid | changed if not self._blocked[n]]
+        frontier = []
+        for v in seeds:
+            if v in source_set:
+                best, best_u, best_owner = 0.0, None, v
+            else:
+                best, best_u, best_owner = math.inf, None, None
+                for u, w in self._in.get(v, ()):
+                    if u in self.arrival and not self._blocked.get(u, False):
+                        nd = self.arrival[u] + w
+                        if nd < best:
+                            best, best_u, best_owner = nd, u, self.owner[u]
+            if best <= self.max_cost and best < self.arrival.get(v, math.inf):
+                self.arrival[v] = best
+                self.owner[v] = best_owner
+                self.parent[v] = best_u
+                frontier.append((best, v))
+        heapq.heapify(frontier)
+        self._dijkstra(frontier)
+        return invalid | changed
+
+    def within(self, cutoff):
+        """{facility: [nodes reachable within cutoff]}"""
+        self.refresh()
+        out = {s: [] for s in self.sources}
+        for n, d in self.arrival.items():
+            if d <= cutoff:
+                out[self.owner[n]].append(n)
+        return out
+
+    def bands(self, cutoffs=(10, 20, 30)):
+        """{facility: {cutoff: [nodes first reached in that band]}}"""
+        self.refresh()
+        cutoffs = sorted(cutoffs)
+        out = {s: {c: [] for c in cutoffs} for s in self.sources}
+        for n, d in self.arrival.items():
+            for c in cutoffs:
+                if d <= c:
+                    out[self.owner[n]][c].append(n)
+                    break
+        return out
+
+
+def isochrones(graph: MultiModalGraph, sources, max_cost=math.inf, **weight_kwargs):
+    with Isochrones(graph, sources, max_cost, **weight_kwargs) as iso:
+        return dict(iso.arrival), dict(iso.owner)
+
+
 def run_search_module():
     g = build_bbsr_55_exact()
 
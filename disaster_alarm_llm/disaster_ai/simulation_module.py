@@ -0,0 +1,230 @@
+
+import numpy as np
+
+from disaster_ai.qlearning_module import ACTIONS, ACTION_INDEX, LEVEL_STATE
+from disaster_ai.mdp_module import TabularMDP
+
+
+# Factor values index qlearning_module.RISK_LEVELS / RESOURCE_LEVELS (Low -> High),
+# so LEVEL_STATE[risk, resources] is the matching coarse state id.
+
+EVACUATE = ACTION_INDEX["EvacuateNow"]
+WAIT = ACTION_INDEX["WaitAndObserve"]
+DRONE = ACTION_INDEX["SendDrone"]
+PREDEPLOY = ACTION_INDEX["PreDeployTeams"]
+
+
+class FactoredDisasterEnv:
+    """
+    Stochastic disaster environment with factored state
+        (risk, resources, time_to_landfall, teams_deployed)
+
+    risk       0..2   Low / Med / High
+    resources  0..2   Low / Mid / High
+    ttl        0..H   steps until landfall, 0 is terminal (absorbing)
+    teams      0..K   rescue teams already positioned in the field;
+                      teams are interchangeable, so the count stands in
+                      for per-team locations.
+
+    Given (s, a) the three non-time factors move independently by -1, 0
+    or +1, so every state-action has at most 3*3*2 = 18 successors. The
+    per-factor probabilities are derived from Bayesian network posteriors
+    (see from_posteriors), which is what replaces the deterministic
+    next_state of qlearning_module.
+    """
+
+    def __init__(self, p_flood=0.55, p_bridge=0.8, p_disease=0.25,
+                 horizon=12, n_teams=3):
+        self.p_flood = float(p_flood)
+        self.p_bridge = float(p_bridge)
+        self.p_disease = float(p_disease)
+        self.horizon = int(horizon)
+        self.n_teams = int(n_teams)
+        self.dims = (3, 3, self.horizon + 1, self.n_teams + 1)
+        self.n_states = int(np.prod(self.dims))
+        self.n_actions = len(ACTIONS)
+        self._build_tables()
+
+    @classmethod
+    def from_posteriors(cls, bayes, **kwargs):
+        """bayes is the {target: probability} dict from run_bayesian_module."""
+        return cls(p_flood=bayes.get("Flood", 0.5),
+                   p_bridge=bayes.get("Bridge_Collapse", 0.5),
+                   p_disease=bayes.get("Water_Borne_Disease", 0.25),
+                   **kwargs)
+
+    # ----------------------------------------------------------------
+    # Factor transition tables, probabilities over deltas (-1, 0, +1)
+    # ----------------------------------------------------------------
+    def _build_tables(self):
+        A = self.n_actions
+        pf, pb = self.p_flood, self.p_bridge
+
+        # risk_p[a, risk] -> P(delta)
+        up = np.full(A, pf * 0.5)
+        down = np.zeros(A)
+        up[WAIT] = pf
+        down[DRONE] = 0.6
+        down[EVACUATE] = 0.5 * (1.0 - 0.5 * pb)   # weak bridges slow evacuation
+        down[PREDEPLOY] = 0.4
+        risk_p = np.zeros((A, 3, 3))
+        for r in range(3):
+            d = down if r > 0 else np.zeros(A)
+            u = up * (1.0 - d) if r < 2 else np.zeros(A)
+            risk_p[:, r, 0] = d
+            risk_p[:, r, 2] = u
+            risk_p[:, r, 1] = 1.0 - d - u
+        self.risk_p = risk_p
+
+        # res_p[a, res] -> P(delta)
+        spend = np.zeros(A)
+        spend[EVACUATE] = 0.9
+        spend[PREDEPLOY] = 0.9
+        spend[DRONE] = 0.5
+        refill = np.zeros(A)
+        refill[WAIT] = 0.3
+        res_p = np.zeros((A, 3, 3))
+        for lvl in range(3):
+            d = spend if lvl > 0 else np.zeros(A)
+            u = refill if lvl < 2 else np.zeros(A)
+            res_p[:, lvl, 0] = d
+            res_p[:, lvl, 2] = u
+            res_p[:, lvl, 1] = 1.0 - d - u
+        self.res_p = res_p
+
+        # team_p[a, has_resources] -> P(one more team deployed)
+        team_p = np.zeros((A, 2))
+        team_p[PREDEPLOY, 1] = 0.8
+        self.team_p = team_p
+
+        # step reward table, same shape as qlearning_module.reward
+        step_r = np.full((A, 3), -1.0)
+        step_r[PREDEPLOY, :] = 10.0
+        step_r[EVACUATE, 2] = 50.0
+        step_r[DRONE, 2] = 25.0
+        step_r[WAIT, 2] = -40.0
+        self.step_r = step_r
+
+        # only the first two cut points are needed to sample a delta
+        self._risk_cdf = np.cumsum(risk_p, axis=-1)[..., :2]
+        self._res_cdf = np.cumsum(res_p, axis=-1)[..., :2]
+
+    # ----------------------------------------------------------------
+    # Encoding
+    # ----------------------------------------------------------------
+    def encode(self, risk, res, ttl, teams):
+        return np.ravel_multi_index((risk, res, ttl, teams), self.dims)
+
+    def decode(self, s):
+        return np.unravel_index(s, self.dims)
+
+    def coarse_state(self, s):
+        """Project to the 9 qlearning_module STATES ids (risk x resources)."""
+        risk, res, _, _ = self.decode(s)
+        return LEVEL_STATE[risk, res]
+
+    def is_terminal(self, s):
+        return self.decode(s)[2] == 0
+
+    # ----------------------------------------------------------------
+    # Rewards
+    # ----------------------------------------------------------------
+    def _reward(self, risk, res, ttl, teams, a):
+        r = self.step_r[a, risk]
+        # impact at landfall: exposure grows with risk, shrinks with teams
+        landfall = ttl == 1
+        impact = -60.0 * risk * (1.0 + self.p_disease) + 15.0 * teams
+        r = r + np.where(landfall, impact, 0.0)
+        return np.where(ttl == 0, 0.0, r)
+
+    def reward(self, s, a):
+        risk, res, ttl, teams = self.decode(s)
+        return self._reward(risk, res, ttl, teams, a)
+
+    # ----------------------------------------------------------------
+    # Simulator kernel
+    # ----------------------------------------------------------------
+    def reset(self, n, rng):
+        """n start states with full time-to-landfall and no teams out."""
+        risk = rng.integers(3, size=n)
+        res = rng.integers(3, size=n)
+        ttl = np.full(n, self.horizon)
+        teams = np.zeros(n, dtype=np.int64)
+        return self.encode(risk, res, ttl, teams)
+
+    def step(self, s, a, rng):
+        """
+        Vectorized transition for n environments at once.
+        Returns (next_states, rewards, done). Terminal states stay put.
+        """
+        risk, res, ttl, teams = self.decode(s)
+        r = self._reward(risk, res, ttl, teams, a)
+
+        u = rng.random((3, s.shape[0]))
+        d_risk = (u[0, :, None] > self._risk_cdf[a, risk]).sum(axis=1) - 1
+        d_res = (u[1, :, None] > self._res_cdf[a, res]).sum(axis=1) - 1
+        d_team = u[2] < self.team_p[a, (res > 0).astype(np.int64)]
+
+        alive = ttl > 0
+        risk = np.where(alive, risk + d_risk, risk)
+        res = np.where(alive, res + d_res, res)
+        teams = np.where(alive & d_team, np.minimum(teams + 1, self.n_teams), teams)
+        ttl = np.where(alive, ttl - 1, ttl)
+
+        s_next = self.encode(risk, res, ttl, teams)
+        return s_next, r, ttl == 0
+
+    # ----------------------------------------------------------------
+    # Exact model, for mdp_module solvers
+    # ----------------------------------------------------------------
+    def _kernel(self, s, a):
+        risk, res, ttl, teams = self.decode(s)
+        alive = ttl > 0
+
+        pr = self.risk_p[a, risk]                           # (n, 3)
+        pq = self.res_p[a, res]                             # (n, 3)
+        pt1 = self.team_p[a, (res > 0).astype(np.int64)]    # (n,)
+        pt = np.stack([1.0 - pt1, pt1], axis=1)             # (n, 2)
+
+        deltas = np.array([-1, 0, 1])
+        r2 = np.clip(risk[:, None] + deltas, 0, 2)
+        q2 = np.clip(res[:, None] + deltas, 0, 2)
+        t2 = np.minimum(teams[:, None] + np.array([0, 1]), self.n_teams)
+        ttl2 = np.maximum(ttl - 1, 0)
+
+        nxt = self.encode(r2[:, :, None, None], q2[:, None, :, None],
+                          ttl2[:, None, None, None], t2[:, None, None, :])
+        p = pr[:, :, None, None] * pq[:, None, :, None] * pt[:, None, None, :]
+        nxt = nxt.reshape(len(s), -1)
+        p = p.reshape(len(s), -1)
+
+        # terminal states are absorbing
+        nxt[~alive] = s[~alive, None]
+        p[~alive] = 0.0
+        p[~alive, 0] = 1.0
+        return nxt, p
+
+    def to_mdp(self):
+        return TabularMDP.from_kernel(self.n_states, self.n_actions,
+                                      self._kernel, self.reward,
+                                      actions=list(ACTIONS))
+
+
+
+if __name__ == "__main__":
+    import time
+    from disaster_ai.mdp_module import value_iteration
+
+    env = FactoredDisasterEnv()
+    mdp = env.to_mdp()
+    V, policy, _ = value_iteration(mdp, gamma=0.95)
+
+    rng = np.random.default_rng(0)
+    s = env.reset(1_000_000, rng)
+    t0 = time.perf_counter()
+    for _ in range(env.horizon):
+        s, _, _ = env.step(s, policy[s], rng)
+    dt = time.perf_counter() - t0
+
+    print(f"\nStates: {env.n_states}")
+    print(f"Simulated steps/sec: {1_000_000 * env.horizon / dt:,.0f}")
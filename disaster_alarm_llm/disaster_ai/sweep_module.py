@@ -0,0 +1,155 @@
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from disaster_ai.qlearning_module import (
+    train_qlearning, greedy_return, save_qtable_binary, TRAINING_DEFAULTS
+)
+
+
+DEFAULT_GRID = {
+    "alpha": (0.05, 0.1, 0.2),
+    "gamma": (0.9,),
+    "epsilon": (0.05, 0.1, 0.2),
+    "episodes": (2000,),
+}
+
+
+def expand_grid(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def chunk_sizes(episodes, checkpoints):
+    """
+    Split `episodes` into at most `checkpoints` chunks that sum to it
+    exactly; the first episodes % checkpoints chunks get one extra.
+    """
+    checkpoints = max(1, min(checkpoints, episodes))
+    size, extra = divmod(episodes, checkpoints)
+    return [size + (i < extra) for i in range(checkpoints)]
+
+
+def _run_config(job):
+    """
+    Worker: train one (config, seed) pair in `checkpoints` chunks and
+    record the greedy-policy return after each chunk.
+    """
+    config, seed, checkpoints, eval_gamma = job
+
+    Q = None
+    curve = []
+    for i, chunk in enumerate(chunk_sizes(config["episodes"], checkpoints)):
+        Q = train_qlearning(
+            episodes=chunk,
+            alpha=config["alpha"],
+            gamma=config["gamma"],
+            epsilon=config["epsilon"],
+            seed=[seed, i],
+            Q=Q,
+        )
+        curve.append(greedy_return(Q, gamma=eval_gamma))
+
+    return {
+        "config": config,
+        "seed": seed,
+        "Q": Q,
+        "curve": np.array(curve),
+        "policy": Q.argmax(axis=1),
+    }
+
+
+def policy_agreement(policies):
+    """Fraction of (run, state) entries that agree with the per-state majority action."""
+    policies = np.asarray(policies)
+    majority = np.array([np.bincount(col).argmax() for col in policies.T])
+    return float((policies == majority).mean())
+
+
+def sweep_qlearning(grid=None, seeds=(0, 1, 2, 3), processes=None,
+                    checkpoints=20, eval_gamma=0.9):
+    """
+    Fan out every grid combination x seed across a process pool.
+
+    Returns:
+        {
+          "summary": [ {config, mean_curve, final_return, final_std, agreement}, ... ],
+          "best":    {config, seed, Q, final_return},
+          "runs":    [per-run results],
+        }
+    Summaries are sorted best first by mean final return.
+    """
+    configs = expand_grid(grid or DEFAULT_GRID)
+    jobs = [(c, s, checkpoints, eval_gamma) for c in configs for s in seeds]
+
+    if processes == 1:
+        runs = [_run_config(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            runs = list(pool.map(_run_config, jobs))
+
+    summary = []
+    n_seeds = len(seeds)
+    for i, config in enumerate(configs):
+        group = runs[i * n_seeds:(i + 1) * n_seeds]
+        curves = np.stack([r["curve"] for r in group])
+        finals = curves[:, -1]
+        summary.append({
+            "config": config,
+            "mean_curve": curves.mean(axis=0),
+            "final_return": float(finals.mean()),
+            "final_std": float(finals.std()),
+            "agreement": policy_agreement([r["policy"] for r in group]),
+        })
+    summary.sort(key=lambda s: s["final_return"], reverse=True)
+
+    best_config = summary[0]["config"]
+    best_run = max((r for r in runs if r["config"] == best_config),
+                   key=lambda r: r["curve"][-1])
+
+    return {
+        "summary": summary,
+        "best": {
+            "config": best_config,
+            "seed": best_run["seed"],
+            "Q": best_run["Q"],
+            "final_return": float(best_run["curve"][-1]),
+        },
+        "runs": runs,
+    }
+
+
+def run_sweep_module(qpath="data/qtable.npy", processes=None, grid=None, seeds=(0, 1, 2, 3)):
+    """
+    Run the sweep (DEFAULT_GRID unless grid is given) and store the best
+    Q-table with save_qtable_binary, where run_qlearning_module loads it from.
+    Returns the summary rows.
+    """
+    out = sweep_qlearning(grid, seeds, processes=processes)
+    best = out["best"]
+    row = next(r for r in out["summary"] if r["config"] == best["config"])
+    telemetry = {
+        "seed": best["seed"],
+        "final_return": best["final_return"],
+        "mean_final_return": row["final_return"],
+        "final_std": row["final_std"],
+        "agreement": row["agreement"],
+        "mean_curve": row["mean_curve"].tolist(),
+    }
+    save_qtable_binary(best["Q"], qpath, hyperparams={**TRAINING_DEFAULTS, **best["config"]},
+                       telemetry=telemetry)
+    return out["summary"]
+
+
+
+if __name__ == "__main__":
+    summary = run_sweep_module(processes=os.cpu_count())
+    print("\nQ-learning sweep (best first):")
+    for row in summary:
+        c = row["config"]
+        print(f"  alpha={c['alpha']:<5} gamma={c['gamma']:<5} eps={c['epsilon']:<5} "
+              f"episodes={c['episodes']:<6} return={row['final_return']:8.2f} "
+              f"±{row['final_std']:.2f} agreement={row['agreement']:.2f}")
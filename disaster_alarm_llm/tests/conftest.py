@@ -0,0 +1,26 @@
+import os
+import sys
+
+# the modules import each other as disaster_ai.*, relative to disaster_alarm_llm/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def pick_use_domain(n):
+    """n tasks sharing one resource: pick{i} takes it, use{i} gives it back."""
+    actions = {}
+    for i in range(n):
+        actions[f"pick{i}"] = {"pre": {"free"}, "add": {f"hold{i}"}, "del": {"free"}}
+        actions[f"use{i}"] = {"pre": {f"hold{i}"}, "add": {f"done{i}", "free"},
+                              "del": {f"hold{i}"}}
+    return actions, {"free"}, {f"done{i}" for i in range(n)}
+
+
+def execute(actions, init, plan):
+    """Final state after running a sequential plan; fails on an unmet precondition."""
+    state = set(init)
+    for a in plan:
+        assert actions[a]["pre"] <= state, a
+        state = (state - actions[a]["del"]) | actions[a]["add"]
+    return state
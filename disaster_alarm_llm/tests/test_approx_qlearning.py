@@ -0,0 +1,53 @@
+import numpy as np
+
+from disaster_ai.approx_qlearning_module import (
+    DEFAULT_GROUPS, FEATURES, TileCodedQ, TileCoder, features_from_bayes, train_tile_coded_q,
+)
+
+
+def make_coder(**kwargs):
+    d = len(FEATURES)
+    kwargs.setdefault("groups", DEFAULT_GROUPS)
+    return TileCoder(np.zeros(d), np.ones(d), **kwargs)
+
+
+def test_active_tiles_in_range():
+    coder = make_coder(n_tilings=4, memory_size=512)
+    X = np.random.default_rng(0).uniform(-0.5, 1.5, (1000, len(FEATURES)))
+    idx = coder.active(X)
+    assert idx.shape == (1000, coder.n_active)
+    assert coder.n_active == coder.n_tilings * len(DEFAULT_GROUPS)
+    assert idx.min() >= 0 and idx.max() < coder.memory_size
+
+
+def test_one_active_tile_per_tiling():
+    coder = make_coder(n_tilings=8, memory_size=1 << 20, groups=[(0,)])
+    idx = coder.active(np.array([[0.25, 0, 0, 0, 0]]))
+    # without hash collisions every tiling contributes its own tile
+    assert len(np.unique(idx)) == coder.n_tilings
+    # nearby inputs share most tiles, far ones share none
+    near = coder.active(np.array([[0.26, 0, 0, 0, 0]]))
+    far = coder.active(np.array([[0.95, 0, 0, 0, 0]]))
+    assert len(np.intersect1d(idx, near)) >= coder.n_tilings // 2
+    assert len(np.intersect1d(idx, far)) == 0
+
+
+def test_update_reduces_td_error():
+    model = TileCodedQ(make_coder())
+    X = features_from_bayes({"Flood": 0.7, "Bridge_Collapse": 0.2}, resources=0.4)[None]
+    a = np.array([2])
+    target = np.array([5.0])
+    errors = []
+    for _ in range(5):
+        errors.append(abs(target[0] - model.values(X)[0, a[0]]))
+        model.update(X, a, target, alpha=0.5)
+    assert all(e2 < e1 for e1, e2 in zip(errors, errors[1:]))
+    # other actions are untouched
+    assert np.all(model.values(X)[0, [0, 1, 3]] == 0)
+
+
+def test_training_is_seeded():
+    m1 = train_tile_coded_q(episodes=256, n_envs=64, seed=3, memory_size=256)
+    m2 = train_tile_coded_q(episodes=256, n_envs=64, seed=3, memory_size=256)
+    np.testing.assert_array_equal(m1.W, m2.W)
+    assert np.isfinite(m1.W).all() and m1.W.any()
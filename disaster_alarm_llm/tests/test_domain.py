@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from disaster_ai import pop_module
+from disaster_ai.domain_module import (
+    DomainSyntaxError, compile_domain_text, load_domain, run_domain_module, to_pop,
+)
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DOMAIN = os.path.join(DATA, "flood_domain.pddl")
+PROBLEM = os.path.join(DATA, "flood_problem.pddl")
+
+
+def test_compile_matches_pop_module(tmp_path):
+    cd = load_domain(DOMAIN, PROBLEM, cache_dir=str(tmp_path))
+    operators, init_state, initial_name, goal_names = to_pop(cd)
+    assert goal_names == pop_module.goal_names
+    for name, op in pop_module.actions.items():
+        if "preconditions" in op:
+            assert operators[name]["preconditions"] == op["preconditions"]
+            assert operators[name]["effects"] == op["effects"]
+    # second load comes from the cache
+    assert os.listdir(tmp_path)
+    cached = load_domain(DOMAIN, PROBLEM, cache_dir=str(tmp_path))
+    assert cached.facts == cd.facts and cached.init == cd.init
+
+
+@pytest.mark.parametrize("engine", ["pop", "graphplan", "forward"])
+def test_run_domain_module(engine, monkeypatch, tmp_path):
+    monkeypatch.chdir(os.path.dirname(DATA))
+    monkeypatch.setattr("disaster_ai.domain_module.load_domain",
+                        lambda d, p: load_domain(d, p, cache_dir=None))
+    assert run_domain_module(engine=engine)
+
+
+def test_syntax_errors():
+    problem = "(define (problem p) (:domain d))"
+    with pytest.raises(DomainSyntaxError):
+        compile_domain_text("(define (domain d) (:action a", problem)
+    with pytest.raises(DomainSyntaxError):
+        compile_domain_text("(define (domain d) (:action a :effect (and (x))) "
+                            "(:action a :effect (and (y))))", problem)
+    with pytest.raises(DomainSyntaxError):
+        compile_domain_text("(define (domain d))",
+                            "(define (problem p) (:domain d) (:init (when (>= P 0.5) (x))))")
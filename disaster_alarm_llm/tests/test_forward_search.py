@@ -0,0 +1,68 @@
+import random
+import time
+
+import pytest
+
+from conftest import execute, pick_use_domain
+from disaster_ai.forward_search_module import StripsTask, forward_plan
+
+
+@pytest.mark.parametrize("heuristic,weight", [("ff", None), ("add", None), ("ff", 1)])
+def test_forward_plan_pick_use(heuristic, weight):
+    actions, init, goals = pick_use_domain(4)
+    plan = forward_plan(init, goals, actions, heuristic, weight)
+    assert len(plan) == 8
+    assert goals <= execute(actions, init, plan)
+
+
+def test_forward_plan_unreachable():
+    actions, init, goals = pick_use_domain(2)
+    assert forward_plan(init, goals | {"never_added"}, actions) is None
+
+
+def random_domain(n_facts, n_actions, seed):
+    rng = random.Random(seed)
+    facts = [f"f{i}" for i in range(n_facts)]
+    actions = {}
+    for i in range(n_actions):
+        actions[f"a{i}"] = {"pre": set(rng.sample(facts, rng.randint(0, 3))),
+                            "add": set(rng.sample(facts, rng.randint(1, 3))),
+                            "del": set(rng.sample(facts, rng.randint(0, 2)))}
+    return actions, set(facts[:5])
+
+
+def test_applicable_matches_full_scan():
+    actions, init = random_domain(60, 200, 0)
+    task = StripsTask(actions, init, set())
+    rng = random.Random(1)
+    for _ in range(50):
+        state = rng.getrandbits(task.n_facts)
+        expected = [a for a in range(len(actions)) if not task.pre[a] & ~state]
+        assert sorted(task.applicable(state)) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_domain_plans_are_valid(seed):
+    actions, init = random_domain(60, 200, seed)
+    # goals: facts reachable from init, so a plan exists
+    reach = set(init)
+    changed = True
+    while changed:
+        changed = False
+        for a in actions.values():
+            if a["pre"] <= reach and not a["add"] <= reach:
+                reach |= a["add"]
+                changed = True
+    goals = set(sorted(reach - init)[:6])
+    for heuristic in ("ff", "add"):
+        plan = forward_plan(init, goals, actions, heuristic)
+        assert goals <= execute(actions, init, plan)
+
+
+@pytest.mark.parametrize("heuristic", ["ff", "add"])
+def test_two_hundred_actions_under_a_second(heuristic):
+    actions, init, goals = pick_use_domain(100)
+    t0 = time.perf_counter()
+    plan = forward_plan(init, goals, actions, heuristic)
+    assert time.perf_counter() - t0 < 1.0
+    assert len(plan) == 200 and goals <= execute(actions, init, plan)
@@ -0,0 +1,95 @@
+import pytest
+
+from conftest import execute, pick_use_domain
+from disaster_ai.graphplan_module import (
+    IncrementalPlanner, PlanningGraph, bits, get_actions, get_initial_state, graphplan
+)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5])
+def test_plans_longer_than_level_off_depth(n):
+    # the graph levels off after two levels, but the plan needs 2n
+    actions, init, goals = pick_use_domain(n)
+    plan = PlanningGraph(actions, init).solve(goals)
+    assert plan is not None
+    assert sum(len(step) for step in plan) == 2 * n
+    assert goals <= execute(actions, init, [a for step in plan for a in step])
+
+
+def test_unsolvable_after_level_off():
+    actions = {
+        "x": {"pre": {"free"}, "add": {"A"}, "del": {"free", "B"}},
+        "y": {"pre": {"free"}, "add": {"B"}, "del": {"free", "A"}},
+    }
+    assert PlanningGraph(actions, {"free"}).solve({"A", "B"}) is None
+
+
+def test_unknown_goal_fact():
+    actions, init, goals = pick_use_domain(2)
+    assert PlanningGraph(actions, init).solve(goals | {"never_added"}) is None
+
+
+def test_default_domain():
+    assert graphplan()
+
+
+def test_incremental_update_before_first_plan():
+    actions, init, goals = pick_use_domain(3)
+    planner = IncrementalPlanner(actions, init=init)
+    pg = planner.update(added={"hold0"})
+    assert planner.current_init == frozenset({"free", "hold0"})
+    assert pg.solve(goals) is not None
+
+    default = IncrementalPlanner()
+    default.update()
+    assert default.plan() == graphplan()
+
+
+def _named_layers(pg):
+    """Fact layers with their mutex pairs, by name, so graphs over different ids compare."""
+    return [({pg.fact_names[f] for f in bits(pg.facts[k])},
+             {(pg.fact_names[f], pg.fact_names[g])
+              for f in bits(pg.facts[k]) for g in bits(pg.fact_mutex[k][f])})
+            for k in range(pg.levels + 1)]
+
+
+def test_rebase_shares_layers_from_the_top_level():
+    # one added fact; the graph has a single level, so only the top can match
+    pg = PlanningGraph(get_actions(), get_initial_state())
+    pg.expand()
+    rebased = pg.rebase(get_initial_state() | {"DroneAssessmentDone"})
+    assert rebased.reused_from == 1
+
+    pg.expand()
+    rebased = pg.rebase(get_initial_state() | {"DroneAssessmentDone"})
+    assert rebased.reused_from == 1
+    assert rebased.action_mutex[1] is pg.action_mutex[1]
+    assert rebased.fact_mutex[2] is pg.fact_mutex[2]
+
+
+def test_rebase_after_one_fact_changes():
+    actions, init, goals = pick_use_domain(3)
+    pg = PlanningGraph(actions, init)
+    pg.solve(goals)
+    rebased = pg.rebase(init | {"done0"})
+    assert rebased.reused_from is not None and rebased.reused_from < pg.levels
+    assert rebased.actions[rebased.reused_from:] == pg.actions[rebased.reused_from:]
+
+    fresh = PlanningGraph(actions, init | {"done0"})
+    while fresh.levels < rebased.levels:
+        fresh.expand()
+    assert _named_layers(rebased) == _named_layers(fresh)
+
+
+def test_rebase_cleared_risk_matches_a_fresh_graph():
+    # the cleared fact never comes back, every layer is patched, none shared
+    pg = PlanningGraph(get_actions(), get_initial_state())
+    for _ in range(3):
+        pg.expand()
+    init = get_initial_state() - {"DiseaseRisk"}
+    rebased = pg.rebase(init)
+    fresh = PlanningGraph(get_actions(), init)
+    for _ in range(3):
+        fresh.expand()
+    assert _named_layers(rebased) == _named_layers(fresh)
+    assert rebased.solve({"PopulationEvacuated"}) == fresh.solve({"PopulationEvacuated"})
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("ollama")
+
+from disaster_ai import llm_final
+
+
+class StubClient:
+    """ollama.AsyncClient stand-in: streams each word of a canned reply."""
+
+    replies = {}
+
+    async def chat(self, model, messages, stream, options):
+        prompt = messages[0]["content"]
+        reply = self.replies.get(prompt, f"reply to {prompt[:10]}")
+
+        async def chunks():
+            for word in reply.split():
+                await asyncio.sleep(0)
+                if word == "FAIL":
+                    raise RuntimeError("generation failed")
+                yield {"message": {"content": word + " "}}
+
+        return chunks()
+
+
+def collect(prompts, client):
+    async def main():
+        return [item async for item in llm_final.stream_multilingual("m", prompts, client)]
+    return asyncio.run(main())
+
+
+def test_pieces_interleave_per_language():
+    StubClient.replies = {"p_en": "a b c d", "p_or": "w x y z"}
+    items = collect({"en": "p_en", "or": "p_or"}, StubClient())
+    langs = [lang for lang, _ in items]
+    assert [p for lang, p in items if lang == "en"] == ["a ", "b ", "c ", "d "]
+    assert [p for lang, p in items if lang == "or"] == ["w ", "x ", "y ", "z "]
+    # both streams progress together rather than one after the other
+    assert langs.index("or") < len(langs) - langs[::-1].index("en") - 1
+
+
+def test_failing_prompt_raises():
+    StubClient.replies = {"p_en": "a b c d e f", "p_or": "w FAIL"}
+    with pytest.raises(RuntimeError):
+        asyncio.run(llm_final.agenerate_multilingual(
+            "m", {"en": "p_en", "or": "p_or"}, client=StubClient()))
+
+
+def test_sync_wrapper_inside_running_loop(monkeypatch):
+    StubClient.replies = {}
+    monkeypatch.setattr(llm_final.ollama, "AsyncClient", StubClient)
+    seen = []
+
+    async def main():
+        return llm_final.generate_disaster_advisory_integrated(
+            "m", on_token=lambda lang, piece: seen.append(lang))
+
+    advisory = asyncio.run(main())
+    assert "SECTION 1" in advisory and "SECTION 3" in advisory
+    assert {"en", "or"} <= set(seen)
+    # and outside any loop
+    assert llm_final.generate_disaster_advisory_integrated("m") == advisory
+
+
+def test_generated_odia_text_is_returned():
+    out = llm_final.format_advisory("plan", {"en": "english", "or": "ଓଡ଼ିଆ ପାଠ"})
+    assert "english" in out and "ଓଡ଼ିଆ ପାଠ" in out
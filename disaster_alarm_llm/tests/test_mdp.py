@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from disaster_ai.mdp_module import (
+    TabularMDP, compile_mdp, evaluate_policy, policy_iteration, run_mdp_module, value_iteration,
+)
+from disaster_ai.qlearning_module import compile_environment
+
+# a corridor A - B - C; reaching C pays 10, every other step costs 1
+CORRIDOR = ["A", "B", "C"]
+MOVES = ["left", "right"]
+
+
+def corridor_next(s, a):
+    i = CORRIDOR.index(s)
+    if s == "C":
+        return "C"
+    return CORRIDOR[max(0, i - 1)] if a == "left" else CORRIDOR[i + 1]
+
+
+def corridor_reward(s, a):
+    if s == "C":
+        return 0.0
+    return 10.0 if corridor_next(s, a) == "C" else -1.0
+
+
+def test_custom_environment_compiles():
+    T, R = compile_environment(CORRIDOR, MOVES, corridor_next, corridor_reward)
+    np.testing.assert_array_equal(T, [[0, 1], [0, 2], [2, 2]])
+    np.testing.assert_array_equal(R, [[-1, -1], [-1, 10], [0, 0]])
+    with pytest.raises(ValueError):
+        compile_environment(["A", "B"], MOVES, corridor_next, corridor_reward)
+
+
+@pytest.mark.parametrize("solver", [value_iteration, policy_iteration])
+def test_corridor_optimal_policy(solver):
+    mdp = compile_mdp(CORRIDOR, MOVES, corridor_next, corridor_reward)
+    V, policy, _ = solver(mdp, gamma=0.9)
+    assert [MOVES[a] for a in policy[:2]] == ["right", "right"]
+    np.testing.assert_allclose(V, [-1 + 0.9 * 10, 10, 0], atol=1e-6)
+
+
+def test_stochastic_mdp_matches_closed_form():
+    # one state, action 0 pays 1 and stays; action 1 pays 2 but ends (absorbing, 0) half the time
+    next_idx = [[[0, 0], [0, 1]], [[1, 1], [1, 1]]]
+    probs = [[[1.0, 0.0], [0.5, 0.5]], [[1.0, 0.0], [1.0, 0.0]]]
+    rewards = [[1.0, 2.0], [0.0, 0.0]]
+    mdp = TabularMDP(next_idx, probs, rewards)
+    gamma = 0.9
+    # stay forever: 1 / (1 - 0.9) = 10; gamble: 2 / (1 - 0.45) ~ 3.64
+    V, policy, _ = value_iteration(mdp, gamma)
+    assert policy[0] == 0
+    assert V[0] == pytest.approx(10.0, abs=1e-6)
+    np.testing.assert_allclose(evaluate_policy(mdp, np.array([1, 0]), gamma)[0], 2 / 0.55)
+    np.testing.assert_allclose(evaluate_policy(mdp, np.array([1, 0]), gamma, exact_limit=0)[0],
+                               2 / 0.55, atol=1e-6)
+
+
+def test_value_and_policy_iteration_agree():
+    mdp = compile_mdp()
+    V1, p1, _ = value_iteration(mdp)
+    V2, p2, _ = policy_iteration(mdp)
+    np.testing.assert_allclose(V1, V2, atol=1e-6)
+    np.testing.assert_allclose(mdp.q_values(V1, 0.9)[np.arange(mdp.n_states), p2], V1, atol=1e-6)
+    assert run_mdp_module(method="policy_iteration") == run_mdp_module()
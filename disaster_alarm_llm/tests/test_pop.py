@@ -0,0 +1,49 @@
+from disaster_ai import pop_module
+from disaster_ai.pop_module import POP, DomainIndex, OrderingClosure, topological_sort
+
+
+def default_index():
+    return DomainIndex(pop_module.actions, pop_module.initial_name, pop_module.init_state,
+                       pop_module.P_flood, pop_module.P_infra, pop_module.goal_names)
+
+
+def test_goal_operators_are_not_achievers():
+    index = default_index()
+    cost = index.fact_costs(pop_module.actions)
+    # achieved only by evacuate_before_flood, which needs alert_community,
+    # monitor_forecast ... ; a goal pseudo-operator would make it cost 1
+    people_safe = ("people_safe", True)
+    assert "rescue_team_work_done" in index.providers[people_safe]
+    assert index.n_providers(people_safe) == 1
+    assert cost[people_safe] > 1
+    assert index.n_providers(("no_such_fact", True)) == 0
+
+
+def test_ordering_closure_rejects_cycles():
+    c = OrderingClosure.empty(3).add(0, 1).add(1, 2)
+    assert c.precedes(0, 2)
+    assert c.add(2, 0) is None
+
+
+def test_topological_sort_respects_ordering():
+    order = topological_sort([("a", "b"), ("b", "c"), ("a", "c")], ["c", "b", "a"])
+    assert order.index("a") < order.index("b") < order.index("c")
+
+
+def check_plan(plan):
+    actions = plan["actions"]
+    assert not plan["open_preconds"]
+    order = topological_sort(plan["ordering"], sorted(actions))
+    for prov, fact, cons in plan["causal_links"]:
+        assert prov in actions and cons in actions
+        assert order.index(prov) < order.index(cons)
+
+
+def test_default_domain_plans():
+    for kwargs in ({}, {"strategy": "best_first", "heuristic": "add",
+                        "flaw": "least_commitment"}):
+        plan = POP(pop_module.initial_name, pop_module.goal_names, pop_module.actions,
+                   pop_module.init_state, pop_module.P_flood, pop_module.P_infra, **kwargs)
+        assert plan is not None
+        assert set(pop_module.goal_names) <= plan["actions"]
+        check_plan(plan)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from disaster_ai.qlearning_module import (
+    batched_td_update, load_qtable_binary, save_qtable_binary,
+)
+
+
+def test_batched_td_update_averages_duplicates():
+    Q = np.zeros((3, 2))
+    s = np.array([0, 0, 2])
+    a = np.array([1, 1, 0])
+    td = batched_td_update(Q, s, a, np.array([1.0, 3.0, -2.0]), alpha=0.5)
+    np.testing.assert_allclose(td, [1.0, 3.0, -2.0])
+    np.testing.assert_allclose(Q, [[0.0, 1.0], [0.0, 0.0], [-1.0, 0.0]])
+
+
+def test_batched_td_update_fortran_order():
+    # load_qtable() returns F-ordered arrays; updates must reach Q itself
+    Q = np.asfortranarray(np.zeros((4, 3)))
+    batched_td_update(Q, np.array([1, 3]), np.array([2, 0]), np.array([2.0, 4.0]), alpha=1.0)
+    assert Q[1, 2] == 2.0 and Q[3, 0] == 4.0
+    assert Q.sum() == 6.0
+
+
+def test_batched_td_update_rejects_read_only(tmp_path):
+    path = str(tmp_path / "q.npy")
+    save_qtable_binary(np.zeros((9, 4)), path)
+    Q, _ = load_qtable_binary(path, mmap=True)
+    with pytest.raises(ValueError):
+        batched_td_update(Q, np.array([0]), np.array([0]), np.array([1.0]), alpha=0.1)
@@ -0,0 +1,40 @@
+import numpy as np
+
+from disaster_ai.qlearning_module import ACTIONS, STATES, load_qtable_binary, save_qtable_binary
+from disaster_ai.replay_module import DecisionLog, ReplayBuffer, SumTree, train_from_buffer, train_offline
+
+
+def test_sum_tree_prefix_lookup():
+    tree = SumTree(5)
+    tree.update(np.arange(5), [1.0, 0.0, 2.0, 3.0, 4.0])
+    assert tree.total == 10.0
+    np.testing.assert_array_equal(tree.find(np.array([0.5, 1.0, 2.9, 3.0, 9.99])),
+                                  [0, 2, 2, 3, 4])
+    tree.update([2, 2], [5.0, 5.0])
+    assert tree.total == 13.0
+
+
+def _buffer():
+    n = len(STATES)
+    buf = ReplayBuffer(64)
+    buf.add(np.arange(n), np.arange(n) % len(ACTIONS), 1.0, np.arange(n), True)
+    return buf
+
+
+def test_train_from_buffer_copies_q():
+    Q = np.asfortranarray(np.zeros((len(STATES), len(ACTIONS))))
+    out = train_from_buffer(Q, _buffer(), updates=20, batch_size=8, seed=0)
+    assert not Q.any()
+    assert out.flags.c_contiguous and out.any()
+
+
+def test_train_offline_from_memmapped_q(tmp_path):
+    qpath = str(tmp_path / "q.npy")
+    save_qtable_binary(np.zeros((len(STATES), len(ACTIONS))), qpath)
+    Q, _ = load_qtable_binary(qpath, mmap=True)
+
+    log = DecisionLog(str(tmp_path / "decisions.log"))
+    log.append([STATES[0]] * 4, [ACTIONS[1]] * 4, 2.0, [STATES[1]] * 4)
+    out = train_offline(log, Q, updates_per_chunk=10, batch_size=4, seed=0)
+    assert out[0, 1] > 0
+    assert not np.asarray(Q).any()
@@ -0,0 +1,38 @@
+from disaster_ai import pop_module
+from disaster_ai.scenario_module import ScenarioPlanner
+
+
+MEDICAL = "medical_and_supplies_work_done"
+
+
+def test_goal_names_override():
+    full = ScenarioPlanner().plan(0.55, 0.8)
+    medical = ScenarioPlanner(goal_names=[MEDICAL]).plan(0.55, 0.8)
+    assert set(pop_module.goal_names) <= full["actions"]
+    assert MEDICAL in medical["actions"]
+    assert not (set(pop_module.goal_names) - {MEDICAL}) & medical["actions"]
+    assert len(medical["actions"]) < len(full["actions"])
+
+
+def test_goal_names_override_in_workers():
+    planner = ScenarioPlanner(goal_names=[MEDICAL], processes=2)
+    regions = planner.precompute(resolution=3)
+    assert len(planner.cache) == len(regions)
+    for plan in planner.cache.values():
+        assert plan is None or "rescue_team_work_done" not in plan["actions"]
+
+
+def test_init_state_override_is_custom():
+    init_state = {"action": "start",
+                  "effects": pop_module.init_state["effects"] - {("technicians_available", True)}}
+    planner = ScenarioPlanner(init_state=init_state, goal_names=[MEDICAL])
+    assert planner.custom
+    # stocking medical kits needs technicians, which this initial state lacks
+    assert planner.plan(0.55, 0.8) is None
+
+
+def test_cache_key_includes_goals():
+    a = ScenarioPlanner(goal_names=[MEDICAL])
+    b = ScenarioPlanner()
+    assert a.signature(0.55, 0.8) == b.signature(0.55, 0.8)
+    assert a.key(0.55, 0.8) != b.key(0.55, 0.8)
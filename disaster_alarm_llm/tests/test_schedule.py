@@ -0,0 +1,41 @@
+import pytest
+
+from disaster_ai import pop_module
+from disaster_ai.schedule_module import schedule_plan
+
+
+def small_plan():
+    # start -> a -> c -> goal, start -> b -> goal; a and b share a team
+    return {
+        "actions": {"start", "stock_a", "stock_b", "rescue_c", "goal"},
+        "ordering": {("start", "stock_a"), ("start", "stock_b"), ("stock_a", "rescue_c"),
+                     ("rescue_c", "goal"), ("stock_b", "goal")},
+    }
+
+
+def test_schedule_respects_precedence_and_capacity():
+    plan = small_plan()
+    durations = {"stock_a": 2.0, "stock_b": 1.0, "rescue_c": 3.0}
+    s = schedule_plan(plan, durations, milestones={"start", "goal"})
+    for b, a in plan["ordering"]:
+        assert s["start"][a] >= s["finish"][b]
+    # critical-path priority runs stock_a (on the longer chain) first
+    assert s["start"]["stock_a"] == 0.0 and s["start"]["stock_b"] == 2.0
+    assert s["makespan"] == s["lower_bound"] == 5.0
+    assert s["critical_path"] == ["start", "stock_a", "rescue_c"]
+    assert s["goal_times"] == {"start": 0.0, "goal": 5.0}
+
+
+def test_schedule_extra_capacity():
+    plan = small_plan()
+    s = schedule_plan(plan, {"stock_a": 2.0, "stock_b": 4.0}, capacities={"medical": 2},
+                      milestones={"start", "goal"})
+    assert s["start"]["stock_a"] == s["start"]["stock_b"] == 0.0
+    assert s["makespan"] == pytest.approx(4.0)
+
+
+def test_schedule_pop_plan():
+    plan = pop_module.run_pop_module()
+    s = schedule_plan(plan)
+    assert set(s["start"]) == plan["actions"]
+    assert s["makespan"] >= s["lower_bound"] > 0
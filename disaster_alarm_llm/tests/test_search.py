@@ -0,0 +1,52 @@
+import math
+import random
+
+from disaster_ai.search_module import Isochrones, build_bbsr_55_exact, isochrones
+
+
+def test_isochrones_helper_does_not_leak_listeners():
+    g = build_bbsr_55_exact()
+    hospitals = g.nodes_of_type("hospital")
+    for _ in range(3):
+        arrival, owner = isochrones(g, hospitals)
+    assert g._risk_listeners == []
+    assert set(arrival) == set(owner)
+
+
+def test_refresh_matches_full_sweep():
+    g = build_bbsr_55_exact()
+    hospitals = g.nodes_of_type("hospital")
+    rng = random.Random(0)
+    nodes = sorted(g.coords)
+    with Isochrones(g, hospitals) as iso:
+        for _ in range(20):
+            g.set_node_risk(rng.choice(nodes), calamity=rng.random() < 0.6)
+            iso.refresh()
+            with Isochrones(g, hospitals) as fresh:
+                assert iso.arrival.keys() == fresh.arrival.keys()
+                for n, d in fresh.arrival.items():
+                    assert math.isclose(iso.arrival[n], d)
+    assert g._risk_listeners == []
+
+
+def test_rebuild_sees_new_edges():
+    g = build_bbsr_55_exact()
+    hospitals = g.nodes_of_type("hospital")
+    far = max(isochrones(g, hospitals[:1])[0].items(), key=lambda kv: kv[1])[0]
+    with Isochrones(g, hospitals[:1]) as iso:
+        g.add_edge(hospitals[0], far, "road", 0.5, 0.0, 0.0, 1.0)
+        iso.refresh()
+        assert iso.arrival[far] > 0.5
+        iso.rebuild()
+        assert iso.arrival[far] == 0.5
+
+
+def test_partial_weights_keep_travel_time_profile():
+    g = build_bbsr_55_exact()
+    hospitals = g.nodes_of_type("hospital")
+    base, _ = isochrones(g, hospitals)
+    # only w_time changes; cost, delay and comfort stay weighted at 0
+    doubled, _ = isochrones(g, hospitals, w_time=2.0)
+    assert doubled.keys() == base.keys()
+    for n, d in base.items():
+        assert math.isclose(doubled[n], 2 * d)
@@ -0,0 +1,10 @@
+from disaster_ai.qlearning_module import RESOURCE_LEVELS, RISK_LEVELS, STATES
+from disaster_ai.simulation_module import FactoredDisasterEnv
+
+
+def test_coarse_state_matches_qlearning_states():
+    env = FactoredDisasterEnv()
+    for r, risk in enumerate(RISK_LEVELS):
+        for c, res in enumerate(RESOURCE_LEVELS):
+            s = env.encode(r, c, env.horizon, 0)
+            assert STATES[env.coarse_state(s)] == f"{risk}_{res}"
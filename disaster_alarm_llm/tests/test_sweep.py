@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from disaster_ai import sweep_module
+from disaster_ai.qlearning_module import load_qtable_binary
+from disaster_ai.sweep_module import chunk_sizes, run_sweep_module, sweep_qlearning
+
+
+@pytest.mark.parametrize("episodes,checkpoints", [(50, 20), (5, 20), (2000, 20), (7, 3), (1, 1)])
+def test_chunk_sizes_sum_to_episodes(episodes, checkpoints):
+    sizes = chunk_sizes(episodes, checkpoints)
+    assert sum(sizes) == episodes
+    assert len(sizes) == min(episodes, checkpoints)
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_configured_episodes_are_trained(monkeypatch):
+    trained = []
+    real = sweep_module.train_qlearning
+
+    def counting(**kwargs):
+        trained.append(kwargs["episodes"])
+        return real(**kwargs)
+
+    monkeypatch.setattr(sweep_module, "train_qlearning", counting)
+    grid = {"alpha": (0.1,), "gamma": (0.9,), "epsilon": (0.1,), "episodes": (50,)}
+    out = sweep_qlearning(grid, seeds=(0,), processes=1, checkpoints=20)
+    assert sum(trained) == 50
+    assert len(out["runs"][0]["curve"]) == 20
+
+
+GRID = {"alpha": (0.1, 0.2), "gamma": (0.9,), "epsilon": (0.1,), "episodes": (60,)}
+
+
+def test_sweep_on_two_processes():
+    seeds = (0, 1)
+    out = sweep_qlearning(GRID, seeds, processes=2, checkpoints=4)
+    assert len(out["runs"]) == 4 and len(out["summary"]) == 2
+    for row in out["summary"]:
+        curves = [r["curve"] for r in out["runs"] if r["config"] == row["config"]]
+        np.testing.assert_allclose(row["mean_curve"], np.mean(curves, axis=0))
+        assert row["final_return"] == pytest.approx(np.mean([c[-1] for c in curves]))
+    finals = [row["final_return"] for row in out["summary"]]
+    assert finals == sorted(finals, reverse=True)
+    # same seeds give the same runs in process
+    serial = sweep_qlearning(GRID, seeds, processes=1, checkpoints=4)
+    np.testing.assert_allclose(serial["best"]["Q"], out["best"]["Q"])
+
+
+def test_best_table_round_trips(tmp_path):
+    qpath = str(tmp_path / "qtable.npy")
+    summary = run_sweep_module(qpath, processes=2, grid=GRID, seeds=(0, 1))
+    Q, meta = load_qtable_binary(qpath)
+    assert meta["hyperparams"]["alpha"] == summary[0]["config"]["alpha"]
+    assert meta["hyperparams"]["episodes"] == 60
+    assert meta["telemetry"]["mean_curve"] == pytest.approx(list(summary[0]["mean_curve"]))
+    best = sweep_qlearning(GRID, (0, 1), processes=1)["best"]
+    np.testing.assert_array_equal(Q, best["Q"])